@@ -0,0 +1,202 @@
+"""
+Бенчмарки парсеров и генераторов CI на синтетических репозиториях.
+
+    python benchmarks/run.py --sizes 10,100,1000 --output bench_results.json
+
+GitHub API подменяется локальным stub-сервером (GITHUB_API_URL), каждый замер
+выполняется в отдельном процессе, чтобы peak RSS относился только к нему.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+import urllib.request
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from synthetic import OWNER, build_fixtures, write_git_repo
+from stub_github import StubGitHub
+
+CASES = [
+    "ParserJava.parse_repo",
+    "ParserJavaScript.parse_repo",
+    "ParserPython.parse_repo",
+    "get_dependencies",
+    "get_go_dependencies",
+    "ci_writers",
+]
+
+
+# -----------------------
+# WORKER (отдельный процесс)
+# -----------------------
+def _case_callable(case: str, size: int, repos_dir: str):
+    sys.path.insert(0, os.path.join(ROOT, "parse"))
+
+    if case == "ParserJava.parse_repo":
+        from parse_java.parser_java import ParserJava
+        url = "file://" + os.path.join(repos_dir, f"java-{size}")
+        return lambda: ParserJava(url, temp_folder="repo_tmp").parse_repo()
+
+    if case == "ParserJavaScript.parse_repo":
+        from parse_javascript.parser_javascript import ParserJavaScript
+        return lambda: ParserJavaScript(f"https://github.com/{OWNER}/js-{size}").parse_repo()
+
+    if case == "ParserPython.parse_repo":
+        from parse_python.parser_python import ParserPython
+        return lambda: ParserPython(f"https://github.com/{OWNER}/python-{size}").parse_repo()
+
+    if case == "get_dependencies":
+        from parse_python.autogen_env import get_dependencies
+        return lambda: get_dependencies(OWNER, f"python-{size}")
+
+    if case == "get_go_dependencies":
+        from parse_go.autogen_env_go import get_go_dependencies
+        return lambda: get_go_dependencies(OWNER, f"go-{size}")
+
+    if case == "ci_writers":
+        from parse_python.autogen_env import write_env_yml, write_gitlab_ci_yml
+        from parse_go.autogen_env_go import write_go_mod, generate_gitlab_ci
+        from parse_java.parser_java import ParserJava
+        from parse_javascript.parser_javascript import ParserJavaScript
+
+        python_deps = [(f"package-{i}", f"1.{i}.0") for i in range(size * 10)]
+        go_deps = [(f"github.com/example/mod{i}", f"v1.{i}.0") for i in range(size * 10)]
+        java_data = {"dependencies": {"maven": [], "gradle": [f":module{i}" for i in range(size)]}}
+        js_data = {"ci_config": {"node_version": "20", "install_command": "yarn install",
+                                 "has_build": True, "build_command": "yarn run build",
+                                 "has_test": True, "test_command": "yarn run test"}}
+
+        def run():
+            write_env_yml(python_deps)
+            write_gitlab_ci_yml()
+            write_go_mod(go_deps, OWNER, f"go-{size}")
+            generate_gitlab_ci()
+            ParserJava("unused").save_gitlab_ci(java_data)
+            ParserJavaScript(f"https://github.com/{OWNER}/js-{size}").generate_gitlab_ci(js_data)
+        return run
+
+    raise ValueError(f"Неизвестный сценарий: {case}")
+
+
+def run_worker(case: str, size: int, repeat: int, repos_dir: str):
+    import resource
+
+    work_dir = tempfile.mkdtemp(prefix="bench-work-")
+    os.makedirs(os.path.join(work_dir, "dependencies"))
+    os.makedirs(os.path.join(work_dir, ".gitlab", "workflows"))
+    os.chdir(work_dir)
+
+    fn = _case_callable(case, size, repos_dir)
+    timings = []
+    devnull = open(os.devnull, "w")
+    try:
+        for _ in range(repeat):
+            stdout, sys.stdout = sys.stdout, devnull
+            try:
+                start = time.perf_counter()
+                fn()
+                timings.append(time.perf_counter() - start)
+            finally:
+                sys.stdout = stdout
+    finally:
+        devnull.close()
+        os.chdir(ROOT)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(json.dumps({
+        "seconds_min": min(timings),
+        "seconds_median": statistics.median(timings),
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }))
+
+
+# -----------------------
+# КООРДИНАТОР
+# -----------------------
+def _stub_call(stub_url: str, endpoint: str) -> dict:
+    with urllib.request.urlopen(f"{stub_url}/{endpoint}") as response:
+        return json.loads(response.read())
+
+
+def run_benchmarks(sizes: list, cases: list, repeat: int) -> dict:
+    fixtures = [f for size in sizes for f in build_fixtures(size)]
+    repos_dir = tempfile.mkdtemp(prefix="bench-repos-")
+    stub = StubGitHub(fixtures).start()
+
+    results = []
+    try:
+        if "ParserJava.parse_repo" in cases:
+            for f in fixtures:
+                if f.repo.startswith("java-"):
+                    write_git_repo(os.path.join(repos_dir, f.repo), f.files)
+
+        env = {**os.environ, "GITHUB_API_URL": stub.url, "GITHUB_TOKEN": "bench"}
+        for size in sizes:
+            for case in cases:
+                _stub_call(stub.url, "__reset")
+                proc = subprocess.run(
+                    [sys.executable, os.path.abspath(__file__), "--worker", case,
+                     "--size", str(size), "--repeat", str(repeat), "--repos-dir", repos_dir],
+                    env=env, capture_output=True, text=True
+                )
+                if proc.returncode != 0:
+                    print(f"[FAIL] {case} size={size}\n{proc.stderr}")
+                    continue
+
+                measured = json.loads(proc.stdout.strip().splitlines()[-1])
+                stats = _stub_call(stub.url, "__stats")
+                result = {
+                    "case": case,
+                    "size": size,
+                    **measured,
+                    "requests": stats["requests"] // repeat,
+                    "response_bytes": stats["bytes"] // repeat,
+                }
+                results.append(result)
+                print(f"{case:<30} size={size:<6} {result['seconds_median']:.3f}s "
+                      f"rss={result['peak_rss_kb']}KB requests={result['requests']}")
+    finally:
+        stub.stop()
+        shutil.rmtree(repos_dir, ignore_errors=True)
+
+    return {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark parsers and CI writers on synthetic repositories")
+    parser.add_argument("--sizes", type=str, default="10,100,1000", help="Comma-separated repository sizes")
+    parser.add_argument("--cases", type=str, default=",".join(CASES), help="Comma-separated cases to run")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case (min and median are reported)")
+    parser.add_argument("--output", type=str, default="bench_results.json", help="Where to write JSON results")
+    parser.add_argument("--worker", type=str, help=argparse.SUPPRESS)
+    parser.add_argument("--size", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--repos-dir", type=str, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args.size, args.repeat, args.repos_dir)
+        sys.exit(0)
+
+    report = run_benchmarks(
+        sizes=[int(s) for s in args.sizes.split(",") if s.strip()],
+        cases=[c.strip() for c in args.cases.split(",") if c.strip()],
+        repeat=args.repeat,
+    )
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"[OK] Результаты сохранены: {args.output}")
@@ -0,0 +1,156 @@
+import json
+import base64
+import threading
+from urllib.parse import urlparse, unquote
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class Fixture:
+    """
+    Ответы GitHub API для одного репозитория: /languages, /contents, /git/trees и SBOM.
+    files — {относительный путь: содержимое}.
+    """
+
+    def __init__(self, owner: str, repo: str, files: dict, languages: dict, sbom: dict):
+        self.owner = owner
+        self.repo = repo
+        self.files = files
+        self.languages = languages
+        self.sbom = sbom
+
+    def list_dir(self, path: str):
+        prefix = f"{path}/" if path else ""
+        entries = {}
+        for file_path, content in self.files.items():
+            if not file_path.startswith(prefix):
+                continue
+            rest = file_path[len(prefix):]
+            name = rest.split("/", 1)[0]
+            if "/" in rest:
+                entries.setdefault(name, ("dir", 0))
+            else:
+                entries[name] = ("file", len(content.encode("utf-8")))
+        return entries
+
+    def tree(self):
+        dirs = set()
+        for file_path in self.files:
+            parts = file_path.split("/")[:-1]
+            for i in range(1, len(parts) + 1):
+                dirs.add("/".join(parts[:i]))
+
+        items = [{"path": d, "mode": "040000", "type": "tree"} for d in sorted(dirs)]
+        items += [{"path": p, "mode": "100644", "type": "blob", "size": len(c.encode("utf-8"))}
+                  for p, c in sorted(self.files.items())]
+        return {"sha": "HEAD", "truncated": False, "tree": items}
+
+
+class StubGitHub:
+    """Локальный HTTP-сервер, отдающий записанные ответы вместо api.github.com и считающий запросы."""
+
+    def __init__(self, fixtures: list, host="127.0.0.1", port=0):
+        self.fixtures = {(f.owner, f.repo): f for f in fixtures}
+        self.requests = 0
+        self.bytes_sent = 0
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def stats(self):
+        return {"requests": self.requests, "bytes": self.bytes_sent}
+
+    def reset(self):
+        with self.lock:
+            self.requests = 0
+            self.bytes_sent = 0
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status, body, content_type="application/json", count=True):
+                data = body if isinstance(body, bytes) else json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+                if count:
+                    with stub.lock:
+                        stub.bytes_sent += len(data)
+
+            def do_GET(self):
+                path = unquote(urlparse(self.path).path)
+
+                if path == "/__stats":
+                    return self._send(200, stub.stats(), count=False)
+                if path == "/__reset":
+                    stub.reset()
+                    return self._send(200, stub.stats(), count=False)
+
+                with stub.lock:
+                    stub.requests += 1
+
+                parts = path.strip("/").split("/")
+                if len(parts) < 4 or parts[0] != "repos":
+                    return self._send(404, {"message": "Not Found"})
+
+                fixture = stub.fixtures.get((parts[1], parts[2]))
+                if fixture is None:
+                    return self._send(404, {"message": "Not Found"})
+
+                endpoint, rest = parts[3], "/".join(parts[4:])
+                if endpoint == "languages":
+                    return self._send(200, fixture.languages)
+                if endpoint == "dependency-graph" and rest == "sbom":
+                    return self._send(200, {"sbom": fixture.sbom})
+                if endpoint == "git" and rest.startswith("trees"):
+                    return self._send(200, fixture.tree())
+                if endpoint == "contents":
+                    return self._contents(fixture, rest)
+                return self._send(404, {"message": "Not Found"})
+
+            def _contents(self, fixture, rest):
+                base = f"{stub.url}/repos/{fixture.owner}/{fixture.repo}/contents"
+
+                if rest in fixture.files:
+                    content = fixture.files[rest]
+                    if "raw" in self.headers.get("Accept", ""):
+                        return self._send(200, content.encode("utf-8"), "text/plain")
+                    return self._send(200, {
+                        "name": rest.rsplit("/", 1)[-1],
+                        "path": rest,
+                        "type": "file",
+                        "encoding": "base64",
+                        "content": base64.b64encode(content.encode("utf-8")).decode("ascii"),
+                    })
+
+                entries = fixture.list_dir(rest)
+                if not entries:
+                    return self._send(404, {"message": "Not Found"})
+
+                prefix = f"{rest}/" if rest else ""
+                return self._send(200, [
+                    {"name": name, "path": f"{prefix}{name}", "type": kind, "size": size,
+                     "url": f"{base}/{prefix}{name}"}
+                    for name, (kind, size) in sorted(entries.items())
+                ])
+
+        return Handler
@@ -0,0 +1,77 @@
+import json
+import hashlib
+import threading
+from urllib.parse import urlparse, unquote
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def release_hash(name: str, version: str) -> str:
+    """Детерминированный sha256 «файла» релиза для фикстур."""
+    return hashlib.sha256(f"{name}-{version}".encode("utf-8")).hexdigest()
+
+
+class StubPackageIndex:
+    """
+    Локальный индекс пакетов с PyPI JSON API (/<name>/json) вместо pypi.org: для тестов и бенчмарков.
+    packages — {нормализованное имя: [версии]}; failures — {имя: HTTP-статус}, которым отвечать вместо данных.
+    """
+
+    def __init__(self, packages: dict, host="127.0.0.1", port=0):
+        self.packages = packages
+        self.failures = {}
+        self.requests = 0
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status, body):
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                with stub.lock:
+                    stub.requests += 1
+
+                parts = unquote(urlparse(self.path).path).strip("/").split("/")
+                if len(parts) != 2 or parts[1] != "json":
+                    return self._send(404, {"message": "Not Found"})
+
+                name = parts[0]
+                if name in stub.failures:
+                    return self._send(stub.failures[name], {"message": "Unavailable"})
+                if name not in stub.packages:
+                    return self._send(404, {"message": "Not Found"})
+
+                releases = {
+                    version: [{"filename": f"{name}-{version}.tar.gz",
+                               "digests": {"sha256": release_hash(name, version)}}]
+                    for version in stub.packages[name]
+                }
+                self._send(200, {"info": {"name": name}, "releases": releases})
+
+        return Handler
@@ -0,0 +1,103 @@
+import os
+import json
+import subprocess
+
+from stub_github import Fixture
+
+OWNER = "bench"
+
+
+def _sbom(packages: list) -> dict:
+    """SPDX-SBOM в формате ответа GitHub dependency-graph."""
+    return {
+        "spdxVersion": "SPDX-2.3",
+        "packages": [
+            {"name": name, "versionInfo": version, "externalRefs": [{"referenceLocator": purl}]}
+            for name, version, purl in packages
+        ],
+    }
+
+
+def java_files(size: int) -> dict:
+    """Gradle multi-module: size модулей, у каждого свой build.gradle и исходники."""
+    files = {
+        "settings.gradle": "\n".join(f"include ':module{i}'" for i in range(size)) + "\n",
+        "build.gradle": "java { toolchain { languageVersion = JavaLanguageVersion.of(17) } }\n",
+    }
+    for i in range(size):
+        deps = [f"    implementation 'org.example:lib{j}:1.{j}.0'" for j in range(5)]
+        if i:
+            deps.append(f"    implementation project(':module{i - 1}')")
+        files[f"module{i}/build.gradle"] = "dependencies {\n" + "\n".join(deps) + "\n}\n"
+        files[f"module{i}/src/main/java/org/example/m{i}/App.java"] = f"package org.example.m{i};\nclass App {{}}\n"
+    return files
+
+
+def javascript_files(size: int) -> dict:
+    deps = {f"pkg-{i}": f"^1.{i}.0" for i in range(size)}
+    package_json = {
+        "name": f"js-{size}",
+        "scripts": {"build": "tsc", "test": "jest"},
+        "engines": {"node": ">=18"},
+        "dependencies": {"react": "^18.0.0", **deps},
+        "devDependencies": {"jest": "^29.0.0"},
+    }
+    lock = "".join(f'"pkg-{i}@^1.{i}.0":\n  version "1.{i}.3"\n  resolved "https://registry.example/pkg-{i}"\n\n'
+                   for i in range(size * 10))
+    return {"package.json": json.dumps(package_json, indent=2), "yarn.lock": lock, "src/index.js": "export {}\n"}
+
+
+def python_files(size: int) -> dict:
+    """Глубокое дерево каталогов: size файлов, вложенность растёт с размером."""
+    depth = max(1, len(str(size)) * 2)
+    files = {"requirements.txt": "".join(f"package-{i}=={i % 7}.{i % 11}.0\n" for i in range(size * 10))}
+    for i in range(size):
+        parts = [f"pkg{(i >> level) % 4}" for level in range(depth)]
+        files["/".join(["src", *parts, f"module_{i}.py"])] = f"VALUE = {i}\n"
+    return files
+
+
+def go_files(size: int) -> dict:
+    requires = "".join(f"\tgithub.com/example/mod{i} v1.{i}.0\n" for i in range(size * 10))
+    go_sum = "".join(f"github.com/example/mod{i} v1.{i}.0 h1:abc{i}=\n"
+                     f"github.com/example/mod{i} v1.{i}.0/go.mod h1:def{i}=\n" for i in range(size * 10))
+    return {
+        "go.mod": f"module github.com/{OWNER}/go-{size}\n\ngo 1.21\n\nrequire (\n{requires})\n",
+        "go.sum": go_sum,
+        "main.go": "package main\n\nfunc main() {}\n",
+    }
+
+
+def python_sbom(size: int) -> dict:
+    return _sbom([(f"package-{i}", f"{i % 7}.{i % 11}.0", f"pkg:pypi/package-{i}@{i % 7}.{i % 11}.0")
+                  for i in range(size * 10)])
+
+
+def go_sbom(size: int) -> dict:
+    return _sbom([(f"github.com/example/mod{i}", f"1.{i}.0", f"pkg:golang/github.com/example/mod{i}@v1.{i}.0")
+                  for i in range(size * 10)])
+
+
+def build_fixtures(size: int) -> list:
+    """Фикстуры для stub-сервера: по одному репозиторию каждого типа заданного размера."""
+    return [
+        Fixture(OWNER, f"java-{size}", java_files(size), {"Java": size * 1000}, _sbom([])),
+        Fixture(OWNER, f"js-{size}", javascript_files(size), {"JavaScript": size * 1000}, _sbom([])),
+        Fixture(OWNER, f"python-{size}", python_files(size), {"Python": size * 1000}, python_sbom(size)),
+        Fixture(OWNER, f"go-{size}", go_files(size), {"Go": size * 1000}, go_sbom(size)),
+    ]
+
+
+def write_git_repo(root: str, files: dict) -> str:
+    """Материализует файлы как git-репозиторий (для ParserJava, который клонирует)."""
+    for rel_path, content in files.items():
+        full_path = os.path.join(root, rel_path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, "w", encoding="utf-8") as f:
+            f.write(content)
+
+    git = ["git", "-C", root, "-c", "user.name=bench", "-c", "user.email=bench@localhost"]
+    subprocess.run(["git", "init", "-q", root], check=True)
+    subprocess.run(git + ["add", "-A"], check=True)
+    subprocess.run(git + ["commit", "-q", "-m", "synthetic"], check=True)
+    return root
@@ -0,0 +1,54 @@
+"""
+Оценка времени сгенерированного пайплайна до коммита: граф джоб, критический
+путь, профиль параллелизма и ожидаемое время по сигналам размера репозитория
+или по локальным JUnit-отчётам / выгрузке длительностей прошлых запусков.
+
+    python parse/estimate.py .gitlab/workflows/gitlab-java.yml --runners 4
+    python parse/estimate.py --junit build/test-results --json estimate.json
+"""
+import os
+import glob
+import json
+import argparse
+import yaml
+
+from pipeline.estimator import analyze, format_analysis, scan_signals, load_junit_seconds, load_timings
+
+# Какой результат сканирования описывает репозиторий для каждого сгенерированного шаблона
+SCAN_FILES = {
+    "gitlab-java.yml": "repo_data.yaml",
+    "gitlab-ci-py.yml": "environment.yml",
+    "gitlab-js-ci.yml": "js_repo_analysis.yaml",
+    "gitlab-ci-go.yml": "go.mod",
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Estimate wall time and critical path of generated GitLab CI pipelines")
+    parser.add_argument("workflows", nargs="*", help="Workflow files (default: .gitlab/workflows/*.yml)")
+    parser.add_argument("--scan-dir", type=str, default="dependencies", help="Directory with scan results (repo_data.yaml, go.mod, ...)")
+    parser.add_argument("--path", type=str, default=None, help="Local checkout to count test files in")
+    parser.add_argument("--junit", type=str, default=None, metavar="DIR", help="JUnit XML reports from a previous run")
+    parser.add_argument("--timings", type=str, default=None, help="JSON {job: seconds} from previous pipelines")
+    parser.add_argument("--runners", type=int, default=None, help="Number of concurrent runners (default: unlimited)")
+    parser.add_argument("--json", type=str, default=None, metavar="FILE", help="Also write the full analysis to FILE")
+    args = parser.parse_args()
+
+    workflows = args.workflows or sorted(glob.glob(os.path.join(".gitlab", "workflows", "*.yml")))
+    junit_seconds = load_junit_seconds(args.junit) if args.junit else 0
+    timings = load_timings(args.timings) if args.timings else None
+
+    results = {}
+    for workflow in workflows:
+        with open(workflow, "r", encoding="utf-8") as f:
+            ci = yaml.safe_load(f) or {}
+        scan_file = SCAN_FILES.get(os.path.basename(workflow))
+        signals = scan_signals(os.path.join(args.scan_dir, scan_file) if scan_file else None, args.path)
+        results[workflow] = analyze(ci, signals, junit_seconds, timings, args.runners)
+        print(format_analysis(workflow, results[workflow]))
+        print()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"Оценка сохранена в {args.json}")
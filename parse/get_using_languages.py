@@ -1,17 +1,66 @@
-import requests
+import os
+import registry
+from github_api import API_URL, get as http_get
+from tracing import traced
+
+SKIP_DIRS = {".git", "node_modules", "vendor", ".venv", "venv", "build", "target", "dist", "__pycache__"}
+
+def _add_file(data, name, size, extensions):
+    lang = extensions.get(os.path.splitext(name)[1])
+    if lang:
+        data[lang] = data.get(lang, 0) + size
 
 class Language:
-    def __init__(self, path):
+    def __init__(self, path, local=False, ref=None):
         self.path = path
+        self.local = local
+        self.ref = ref
+        # True, если язык пришлось определить по ветке по умолчанию, хотя задан ref
+        self.used_default_branch = False
         
         parts = self.path.rstrip("/").split("/")
         owner = parts[-2]
         repo = parts[-1]
         
-        self.url = f"https://api.github.com/repos/{owner}/{repo}/languages"
+        self.url = f"{API_URL}/repos/{owner}/{repo}/languages"
+        self.tree_url = f"{API_URL}/repos/{owner}/{repo}/git/trees/{ref}?recursive=1"
         
+    def get_local_languages(self):
+        """Байты кода по языкам в локальном checkout — аналог GitHub /languages."""
+        data = {}
+        extensions = registry.extensions()
+        for root, dirs, files in os.walk(self.path):
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+            for name in files:
+                _add_file(data, name, os.path.getsize(os.path.join(root, name)), extensions)
+        return data
+
+    def get_tree_languages(self):
+        """То же по дереву коммита ref: /languages GitHub считает только для ветки по умолчанию."""
+        response = http_get(self.tree_url)
+        if response.status_code != 200:
+            return None
+        data = {}
+        extensions = registry.extensions()
+        for item in response.json().get("tree", []):
+            parts = item["path"].split("/")
+            if item["type"] == "blob" and not SKIP_DIRS.intersection(parts[:-1]):
+                _add_file(data, parts[-1], item.get("size", 0), extensions)
+        return data
+
+    @traced("language.detect")
     def get_main_language(self):
-        response = requests.get(self.url)
+        if self.local:
+            data = self.get_local_languages()
+            return max(data, key=data.get) if data else None
+
+        if self.ref:
+            data = self.get_tree_languages()
+            if data is not None:
+                return max(data, key=data.get) if data else None
+            self.used_default_branch = True
+
+        response = http_get(self.url)
         if response.status_code == 200:
             data = response.json()
             if data:
@@ -0,0 +1,100 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+from tracing import span, count
+
+# Базовый адрес GitHub REST API: можно переопределить для GitHub Enterprise или локального стенда
+API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com").rstrip("/")
+
+MAX_RATE_LIMIT_RETRIES = 3
+MAX_RATE_LIMIT_WAIT = 60
+
+# Общий пул соединений для всех парсеров (requests импортируется только при первом запросе)
+_session = None
+
+
+def get_session():
+    global _session
+    if _session is None:
+        import requests
+        _session = requests.Session()
+    return _session
+
+# Кэш ответов по ETag: повторный запрос с If-None-Match получает 304 и не тратит rate limit.
+# Ограничен суммарным размером тел: SBOM большого репозитория весит несколько мегабайт
+RESPONSE_CACHE_BYTES = 64 * 1024 * 1024
+_response_cache = OrderedDict()
+_response_cache_bytes = 0
+_response_cache_lock = threading.Lock()
+
+
+def _cache_key(url, headers):
+    headers = headers or {}
+    return url, headers.get("Accept", ""), headers.get("Authorization", "")
+
+
+def _cached(key):
+    with _response_cache_lock:
+        response = _response_cache.get(key)
+        if response is not None:
+            _response_cache.move_to_end(key)
+        return response
+
+
+def _store(key, response):
+    global _response_cache_bytes
+    size = len(response.content)
+    if response.status_code != 200 or not response.headers.get("ETag") or size > RESPONSE_CACHE_BYTES:
+        return
+    with _response_cache_lock:
+        previous = _response_cache.pop(key, None)
+        if previous is not None:
+            _response_cache_bytes -= len(previous.content)
+        _response_cache[key] = response
+        _response_cache_bytes += size
+        while _response_cache_bytes > RESPONSE_CACHE_BYTES:
+            _, evicted = _response_cache.popitem(last=False)
+            _response_cache_bytes -= len(evicted.content)
+
+
+def _rate_limit_delay(response):
+    """Сколько ждать перед повтором, если GitHub ответил rate limit, иначе None."""
+    if response.status_code not in (403, 429):
+        return None
+    retry_after = response.headers.get("Retry-After")
+    if retry_after:
+        return float(retry_after)
+    if response.headers.get("X-RateLimit-Remaining") == "0":
+        reset = response.headers.get("X-RateLimit-Reset")
+        return max(0.0, int(reset) - time.time()) if reset else MAX_RATE_LIMIT_WAIT
+    return None
+
+
+def get(url, **kwargs):
+    """GET с учётом запросов/байт, кэшем по ETag и ожиданием при rate limit."""
+    key = _cache_key(url, kwargs.get("headers"))
+    cached = _cached(key)
+    if cached is not None:
+        kwargs["headers"] = {**(kwargs.get("headers") or {}), "If-None-Match": cached.headers["ETag"]}
+
+    for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+        with span("http.get", url=url):
+            response = get_session().get(url, **kwargs)
+        count("http.requests")
+        count("http.bytes", len(response.content))
+
+        if response.status_code == 304 and cached is not None:
+            count("http.cache_hits")
+            return cached
+        _store(key, response)
+
+        delay = _rate_limit_delay(response)
+        if delay is None or attempt == MAX_RATE_LIMIT_RETRIES:
+            return response
+
+        delay = min(delay, MAX_RATE_LIMIT_WAIT)
+        print(f"Rate limit GitHub API, жду {delay:.0f} с...")
+        with span("http.rate_limit_wait", url=url):
+            time.sleep(delay)
+        count("http.rate_limit_wait_ms", delay * 1000)
@@ -1,56 +1,115 @@
-from parse_python.autogen_env import parse_github_url, get_dependencies, write_env_yml, write_gitlab_ci_yml
-from parse_javascript.parser_javascript import ParserJavaScript
-from parse_java.parser_java import ParserJava
-from parse_go.autogen_env_go import parse_github_url, get_go_dependencies, write_go_mod, generate_gitlab_ci
 import os
-import sys
+import re
+import json
+import hashlib
 import argparse
-from get_using_languages import Language
+from dotenv import load_dotenv
 
-parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+# .env читается один раз при запуске, до импорта модулей, которые берут из окружения токен и адрес API
+load_dotenv()
 
-# добавляем папку в sys.path
-sys.path.insert(0, parent_dir)
-from enums.languages import Languages
+import registry
+from get_using_languages import Language
+from pipeline.matrix import DEFAULT_MAX_MATRIX, parse_targets
+from tracing import tracer, span, merge_summaries, format_summary
 
 class Main:
-    def __init__(self, path):
+    def __init__(self, path, matrix=False, max_matrix=DEFAULT_MAX_MATRIX, go_targets=None, local=False,
+                 index_url=None, lock=False, output_dir=".", ref=None, mirror_dir=None, package_index=None):
         self.path = path
-        self.language = Language(path=path).get_main_language()
+        self.local = local
+        self.index_url = index_url
+        self.lock = lock
+        self.output_dir = output_dir
+        self.ref = ref
+        self.mirror_dir = mirror_dir
+        self.package_index = package_index
+        self.matrix = matrix
+        self.max_matrix = max_matrix
+        self.go_targets = go_targets or []
+        # Источники, которые GitHub отдаёт только для ветки по умолчанию (без ?ref): при заданном ref
+        # результат по ним относится не к запрошенному коммиту
+        self.default_branch_sources = []
+        language = Language(path=path, local=local, ref=ref)
+        self.language = language.get_main_language()
+        if language.used_default_branch:
+            self.uses_default_branch("languages")
         
     def launch_project(self):
-        if self.language == Languages.JAVASCRIPT.value:
-            parser_java_script = ParserJavaScript(path=self.path)
-            data = parser_java_script.parse_repo()
-            parser_java_script.save_to_yaml(data)
-            parser_java_script.generate_gitlab_ci(data)
-        elif self.language == Languages.JAVA.value:
-            parser_java = ParserJava(path=self.path)
-            data = parser_java.parse_repo()
-            parser_java.save_yaml(data)
-            parser_java.save_gitlab_ci(data)
-        elif self.language == Languages.PYTHON.value:
-            owner, repo = parse_github_url(self.path)
-            print(f"→ Получение SBOM из GitHub для: {owner}/{repo} ...")
-            deps = get_dependencies(owner, repo)
-            write_env_yml(deps)
-            write_gitlab_ci_yml()
-        elif self.language == Languages.GO.value:
-            owner, repo = parse_github_url(self.path)
-            print(f"→ Получение SBOM из GitHub для: {owner}/{repo} ...")
-            deps = get_go_dependencies(owner, repo)
-            write_go_mod(deps, owner, repo)
-            generate_gitlab_ci()
+        with span("launch_project", repo=self.path, language=self.language):
+            self._launch()
+
+    def uses_default_branch(self, source):
+        if self.ref and source not in self.default_branch_sources:
+            self.default_branch_sources.append(source)
+
+    def out(self, rel_path):
+        """Путь результата внутри output_dir."""
+        return os.path.normpath(os.path.join(self.output_dir, rel_path))
+
+    def _launch(self):
+        backend = registry.load(self.language)
+        if backend is None:
+            print(f"Язык {self.language} не поддерживается")
+            return
+        os.makedirs(self.out("dependencies"), exist_ok=True)
+        os.makedirs(self.out(".gitlab/workflows"), exist_ok=True)
+        backend(self)
+
+def trace_name(path):
+    """Имя файла трассы: owner_repo для URL, имя каталога для checkout."""
+    parts = [p for p in re.split(r"[/\\]", path.rstrip("/")) if p]
+    return re.sub(r"[^A-Za-z0-9._-]", "_", "_".join(parts[-2:]))
+
+def batch_names(paths):
+    """Уникальные имена для batch-запуска: при совпадении (/a/x/repo и /b/x/repo) добавляется хеш полного пути."""
+    names = [trace_name(path) for path in paths]
+    return {
+        path: name if names.count(name) == 1 else f"{name}-{hashlib.sha1(path.encode()).hexdigest()[:8]}"
+        for path, name in zip(paths, names)
+    }
     
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description="Parse a GitHub repository and generate CI/CD files")
-    parser.add_argument("--repo", type=str, required=True, help="GitHub repository URL")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--repo", type=str, action="append", help="GitHub repository URL (repeat for a batch run)")
+    source.add_argument("--path", type=str, action="append", help="Local checkout directory, no network access (repeat for a batch run)")
+    parser.add_argument("--matrix", action="store_true", help="Generate parallel:matrix jobs for all supported toolchain versions")
+    parser.add_argument("--max-matrix", type=int, default=DEFAULT_MAX_MATRIX, help="Maximum number of jobs in one matrix")
+    parser.add_argument("--go-targets", type=str, default="", help="Go cross-compile targets, e.g. linux/amd64,darwin/arm64")
+    parser.add_argument("--index-url", type=str, default=None, help="Package index (PyPI JSON API or local mirror) used to verify pinned versions")
+    parser.add_argument("--lock", action="store_true", help="Also write dependencies/requirements.lock with hashes")
+    parser.add_argument("--profile", type=str, default=None, metavar="DIR", help="Write a Chrome-trace timeline per repo (and a batch summary) to DIR")
+    parser.add_argument("--output-dir", type=str, default=".", help="Where to write dependencies/ and .gitlab/ (one subdirectory per repo in a batch run)")
     args = parser.parse_args()
-    path = args.repo
-    print(path)
-    
-    main = Main(path)
-    main.launch_project()
+    local = args.path is not None
+    paths = [os.path.abspath(p) for p in args.path] if local else args.repo
+    tracer.enabled = args.profile is not None
+    names = batch_names(paths)
+    batch = len(paths) > 1
+
+    summaries = []
+    for path in paths:
+        print(path)
+        tracer.reset()
+        
+        # В batch-запуске у каждого репозитория свой каталог, иначе результаты перезаписывают друг друга
+        output_dir = os.path.join(args.output_dir, names[path]) if batch else args.output_dir
+        main = Main(path, matrix=args.matrix, max_matrix=args.max_matrix, go_targets=parse_targets(args.go_targets),
+                    local=local, index_url=args.index_url, lock=args.lock, output_dir=output_dir)
+        main.launch_project()
+
+        if args.profile:
+            trace_file = os.path.join(args.profile, f"{names[path]}.trace.json")
+            tracer.write_trace(trace_file)
+            summaries.append(tracer.summary())
+            print(f"[OK] Трасса сохранена: {trace_file}")
+
+    if args.profile:
+        summary = merge_summaries(summaries)
+        with open(os.path.join(args.profile, "summary.json"), "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        print(format_summary(summary))
     
 # python parse/index.py --repo https://github.com/TryGhost/Ghost
 # python parse/index.py --repo https://github.com/syncthing/syncthing
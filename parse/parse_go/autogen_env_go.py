@@ -1,14 +1,12 @@
-import requests
 import sys
 import yaml
 import re
 from typing import List, Tuple
 import os
-from dotenv import load_dotenv
-
-load_dotenv()
-
-GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
+from github_api import API_URL, get as http_get
+from pipeline.optimizer import optimize_pipeline, format_report
+from pipeline.matrix import DEFAULT_MAX_MATRIX, parse_go_mod_versions, parallel_matrix
+from tracing import traced
 
 def parse_github_url(url: str) -> Tuple[str, str]:
     m = re.search(r"github\.com/([^/]+)/([^/]+)", url)
@@ -19,8 +17,7 @@ def parse_github_url(url: str) -> Tuple[str, str]:
     return owner, repo
 
 def _get_headers():
-    import os
-    token = GITHUB_TOKEN or os.environ.get("GITHUB_TOKEN", "")
+    token = os.environ.get("GITHUB_TOKEN", "")
     headers = {
         "Accept": "application/vnd.github+json",
         "X-GitHub-Api-Version": "2022-11-28"
@@ -52,13 +49,88 @@ def normalize_version(v: str) -> str:
         return "v" + v
     return v
 
+@traced("go.versions")
+def get_go_versions(owner: str, repo: str, ref: str = None) -> List[str]:
+    """Версии Go для матрицы по директивам go/toolchain из go.mod (на коммите ref, иначе ветка по умолчанию)."""
+    headers = {**_get_headers(), "Accept": "application/vnd.github.raw+json"}
+    url = f"{API_URL}/repos/{owner}/{repo}/contents/go.mod" + (f"?ref={ref}" if ref else "")
+    resp = http_get(url, headers=headers)
+    if resp.status_code != 200:
+        return []
+    return parse_go_mod_versions(resp.text)
+
+# -----------------------
+# ЛОКАЛЬНЫЙ CHECKOUT
+# -----------------------
+def parse_go_mod_requires(text: str) -> List[Tuple[str, str]]:
+    """Пары (модуль, версия) из директив require в go.mod."""
+    found = {}
+    in_block = False
+    for line in text.splitlines():
+        line = line.split("//", 1)[0].strip()
+        if line.startswith("require ("):
+            in_block = True
+            continue
+        if in_block and line == ")":
+            in_block = False
+            continue
+        if line.startswith("require "):
+            line = line[len("require "):].strip()
+        elif not in_block:
+            continue
+        parts = line.split()
+        if len(parts) >= 2:
+            found[parts[0]] = normalize_version(parts[1])
+    return sorted(found.items())
+
+def parse_go_sum(text: str) -> List[Tuple[str, str]]:
+    """Пары (модуль, версия) из go.sum — запасной вариант, если go.mod пустой."""
+    found = {}
+    for line in text.splitlines():
+        parts = line.split()
+        if len(parts) >= 2 and not parts[1].endswith("/go.mod"):
+            found.setdefault(parts[0], parts[1])
+    return sorted(found.items())
+
+@traced("go.local_deps")
+def get_local_go_dependencies(path: str) -> List[Tuple[str, str]]:
+    for name, parser in (("go.mod", parse_go_mod_requires), ("go.sum", parse_go_sum)):
+        file_path = os.path.join(path, name)
+        if not os.path.exists(file_path):
+            continue
+        with open(file_path, "r", encoding="utf-8") as f:
+            deps = parser(f.read())
+        if deps:
+            return deps
+    return []
+
+def get_local_go_versions(path: str) -> List[str]:
+    file_path = os.path.join(path, "go.mod")
+    if not os.path.exists(file_path):
+        return []
+    with open(file_path, "r", encoding="utf-8") as f:
+        return parse_go_mod_versions(f.read())
+
+def get_local_go_module(path: str) -> Tuple[str, str]:
+    """(owner, repo) по директиве module в go.mod, иначе по имени каталога."""
+    file_path = os.path.join(path, "go.mod")
+    if os.path.exists(file_path):
+        with open(file_path, "r", encoding="utf-8") as f:
+            m = re.search(r"^module\s+(\S+)", f.read(), re.MULTILINE)
+        if m:
+            parts = m.group(1).split("/")
+            if len(parts) >= 3 and parts[0] == "github.com":
+                return parts[1], parts[2]
+    return "local", os.path.basename(os.path.abspath(path))
+
 # -----------------------
 # GO DEPENDENCIES
 # -----------------------
+@traced("go.sbom")
 def get_go_dependencies(owner: str, repo: str) -> List[Tuple[str, str]]:
     headers = _get_headers()
-    url = f"https://api.github.com/repos/{owner}/{repo}/dependency-graph/sbom"
-    resp = requests.get(url, headers=headers)
+    url = f"{API_URL}/repos/{owner}/{repo}/dependency-graph/sbom"
+    resp = http_get(url, headers=headers)
     if resp.status_code != 200:
         raise Exception(f"GitHub API error: {resp.status_code}\n{resp.text}")
     data = resp.json()
@@ -82,6 +154,7 @@ def get_go_dependencies(owner: str, repo: str) -> List[Tuple[str, str]]:
             go_deps.append((mod, ver))
     return go_deps
 
+@traced("go.write_go_mod")
 def write_go_mod(deps: List[Tuple[str, str]], owner: str, repo: str, out_file="dependencies/go.mod", go_version="1.20"):
     module_name = f"github.com/{owner}/{repo}-autogen"
     lines = []
@@ -101,7 +174,9 @@ def write_go_mod(deps: List[Tuple[str, str]], owner: str, repo: str, out_file="d
 # -----------------------
 # GITLAB CI GENERATOR
 # -----------------------
-def generate_gitlab_ci(go_version="1.20", output_file=".gitlab/workflows/gitlab-ci-go.yml"):
+@traced("go.write_gitlab_ci")
+def generate_gitlab_ci(go_version="1.20", output_file=".gitlab/workflows/gitlab-ci-go.yml",
+                       go_versions=None, targets=None, max_matrix=DEFAULT_MAX_MATRIX):
     ci = {
         "stages": ["lint", "build", "test", "deploy"],
         "lint": {
@@ -117,7 +192,7 @@ def generate_gitlab_ci(go_version="1.20", output_file=".gitlab/workflows/gitlab-
             "image": f"golang:{go_version}",
             "script": [
                 "go mod tidy",
-                "go build -v ./..."
+                "go build -v -o bin/ ./..."
             ],
             "artifacts": {
                 "paths": ["./"],
@@ -146,6 +221,27 @@ def generate_gitlab_ci(go_version="1.20", output_file=".gitlab/workflows/gitlab-
         }
     }
 
+    # Матрица версий Go для тестов
+    test_matrix = parallel_matrix({"GO_VERSION": go_versions or []}, max_matrix)
+    if test_matrix:
+        ci["test"]["image"] = "golang:${GO_VERSION}"
+        ci["test"]["parallel"] = test_matrix
+
+    # Кросс-компиляция под GOOS/GOARCH
+    if targets:
+        ci["build"]["script"] = [
+            "go mod tidy",
+            'GOOS="${GO_TARGET%/*}" GOARCH="${GO_TARGET#*/}" go build -v -o "bin/${GO_TARGET}/" ./...'
+        ]
+        build_matrix = parallel_matrix({"GO_TARGET": targets}, max_matrix)
+        if build_matrix:
+            ci["build"]["parallel"] = build_matrix
+        else:
+            ci["build"]["variables"] = {"GO_TARGET": targets[0]}
+
+    ci, report = optimize_pipeline(ci)
+
     with open(output_file, "w", encoding="utf-8") as f:
         yaml.dump(ci, f, allow_unicode=True, sort_keys=False)
-    print(f"[OK] GitLab CI файл создан: {output_file}")
\ No newline at end of file
+    print(f"[OK] GitLab CI файл создан: {output_file}")
+    print(format_report(report))
\ No newline at end of file
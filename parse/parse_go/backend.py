@@ -0,0 +1,28 @@
+from parse_go.autogen_env_go import (
+    parse_github_url, get_go_dependencies, get_go_versions, get_local_go_dependencies, get_local_go_versions,
+    get_local_go_module, write_go_mod, generate_gitlab_ci
+)
+from pipeline.matrix import minimum_version
+
+DEFAULT_GO_VERSION = "1.20"
+
+
+def run(main):
+    if main.local:
+        print(f"→ Чтение go.mod из checkout: {main.path} ...")
+        owner, repo = get_local_go_module(main.path)
+        deps = get_local_go_dependencies(main.path)
+        go_versions = get_local_go_versions(main.path)
+    else:
+        owner, repo = parse_github_url(main.path)
+        print(f"→ Получение SBOM из GitHub для: {owner}/{repo} ...")
+        deps = get_go_dependencies(owner, repo)
+        main.uses_default_branch("sbom")
+        go_versions = get_go_versions(owner, repo, ref=main.ref)
+
+    # lint/build и go.mod — на минимальной версии из go.mod, матрица — только для тестов
+    go_version = minimum_version(go_versions, default=DEFAULT_GO_VERSION)
+    write_go_mod(deps, owner, repo, out_file=main.out("dependencies/go.mod"), go_version=go_version)
+    generate_gitlab_ci(go_version=go_version, output_file=main.out(".gitlab/workflows/gitlab-ci-go.yml"),
+                       go_versions=go_versions if main.matrix else None, targets=main.go_targets,
+                       max_matrix=main.max_matrix)
@@ -0,0 +1,15 @@
+from parse_java.parser_java import ParserJava
+from pipeline.matrix import minimum_version
+
+DEFAULT_JAVA_VERSION = "17"
+
+
+def run(main):
+    parser_java = ParserJava(path=main.path, temp_folder=main.out("repo_tmp"), local=main.local,
+                             mirror_dir=main.mirror_dir, ref=main.ref)
+    data = parser_java.parse_repo()
+    parser_java.save_yaml(data, output=main.out("dependencies/repo_data.yaml"))
+    java_versions = data["java_versions"] if main.matrix else None
+    parser_java.save_gitlab_ci(data, output=main.out(".gitlab/workflows/gitlab-java.yml"),
+                               java_version=minimum_version(data["java_versions"], default=DEFAULT_JAVA_VERSION),
+                               java_versions=java_versions, max_matrix=main.max_matrix)
@@ -1,31 +1,85 @@
 import os
+import re
 import yaml
 import shutil
+import hashlib
 import subprocess
+import threading
 from xml.etree import ElementTree
+from pipeline.optimizer import optimize_pipeline, format_report
+from pipeline.matrix import JAVA_VERSIONS, DEFAULT_MAX_MATRIX, parse_java_release, versions_from_minimum, parallel_matrix
+from tracing import traced
+
+# Gradle 8.10 запускается на JDK 11–23 (8.3 не поддерживает JDK 21), поэтому тег общий для всех версий матрицы
+GRADLE_IMAGE = "gradle:8.10-jdk{java}"
+MAVEN_IMAGE = "maven:3.9-eclipse-temurin-{java}"
 
 class ParserJava:
-    def __init__(self, path: str, temp_folder="repo_tmp"):
+    # Блокировки зеркал: одно зеркало не обновляется параллельно из разных потоков
+    _mirror_locks = {}
+    _mirror_locks_guard = threading.Lock()
+
+    def __init__(self, path: str, temp_folder="repo_tmp", local=False, mirror_dir=None, ref=None):
         self.repo_url = path
-        self.temp_folder = temp_folder
+        self.local = local
+        self.mirror_dir = mirror_dir
+        if ref and not re.match(r"^[0-9a-fA-F]{7,40}$", ref):
+            raise ValueError(f"ref должен быть хешем коммита: {ref!r}")
+        self.ref = ref
+        # Локальный checkout читаем на месте: без клонирования и удаления
+        self.temp_folder = path if local else temp_folder
         
     @staticmethod
     def job_name(module):
         name = module.strip(":").replace(":", "_")
         return f"build_{name}"
 
+    @staticmethod
+    def module_dir(module):
+        return module.strip(":").replace(":", "/")
+
     # 1. Клонирование репозитория
+    @traced("java.update_mirror")
+    def update_mirror(self):
+        """Держит bare-зеркало репозитория в mirror_dir и дотягивает в него новые коммиты."""
+        name = hashlib.sha1(self.repo_url.encode("utf-8")).hexdigest()[:16]
+        mirror = os.path.join(self.mirror_dir, f"{name}.git")
+
+        with self._mirror_locks_guard:
+            lock = self._mirror_locks.setdefault(mirror, threading.Lock())
+
+        with lock:
+            if os.path.exists(mirror):
+                subprocess.run(["git", "-C", mirror, "remote", "update", "--prune"], check=True)
+            else:
+                os.makedirs(self.mirror_dir, exist_ok=True)
+                subprocess.run(["git", "clone", "--quiet", "--mirror", "--", self.repo_url, mirror], check=True)
+        return mirror
+
+    @traced("java.clone")
     def clone_repo(self):
         if os.path.exists(self.temp_folder):
             shutil.rmtree(self.temp_folder)
 
         print("Клонирую репозиторий...")
+        if self.mirror_dir:
+            mirror = self.update_mirror()
+            subprocess.run(["git", "clone", "--quiet", "--shared", "--", mirror, self.temp_folder], check=True)
+            if self.ref:
+                # "<ref> --": ref — ревизия, а не путь
+                subprocess.run(["git", "-C", self.temp_folder, "checkout", "--quiet", self.ref, "--"], check=True)
+            return
+
         subprocess.run(
-            ["git", "clone", "--depth", "1", self.repo_url, self.temp_folder],
+            ["git", "clone", "--depth", "1", "--", self.repo_url, self.temp_folder],
             check=True
         )
+        if self.ref:
+            subprocess.run(["git", "-C", self.temp_folder, "fetch", "--quiet", "--depth", "1", "--", "origin", self.ref], check=True)
+            subprocess.run(["git", "-C", self.temp_folder, "checkout", "--quiet", "FETCH_HEAD"], check=True)
 
     # 2. Рекурсивный сбор всех файлов
+    @traced("java.walk_tree")
     def parse_files(self):
         files = {}
 
@@ -43,6 +97,7 @@ class ParserJava:
         return files
 
     # 3. Извлечение зависимостей из pom.xml
+    @traced("java.maven_deps")
     def extract_maven_deps(self):
         pom_path = os.path.join(self.temp_folder, "pom.xml")
         deps = []
@@ -96,6 +151,7 @@ class ParserJava:
         return deps
 
     # 4. Извлечение зависимостей из Gradle
+    @traced("java.gradle_deps")
     def extract_gradle_deps(self):
         gradle_files = []
         for root, _, files in os.walk(self.temp_folder):
@@ -125,18 +181,52 @@ class ParserJava:
 
         return sorted(deps)
 
-    # 5. Основной метод
+    # 5. Версии Java из Gradle toolchain / maven.compiler.release
+    @traced("java.java_versions")
+    def extract_java_versions(self):
+        build_files = []
+        for root, _, files in os.walk(self.temp_folder):
+            for f in files:
+                if f in ("pom.xml", "build.gradle", "build.gradle.kts", "gradle.properties"):
+                    build_files.append(os.path.join(root, f))
+
+        releases = set()
+        for file in build_files:
+            try:
+                with open(file, "r", encoding="utf-8") as f:
+                    release = parse_java_release(f.read())
+                if release:
+                    releases.add(release)
+            except:
+                continue
+
+        if not releases:
+            return []
+        return versions_from_minimum(min(releases, key=int), JAVA_VERSIONS)
+
+    # 6. Основной метод
+    @traced("java.parse_repo")
     def parse_repo(self):
-        self.clone_repo()
+        try:
+            if not self.local:
+                self.clone_repo()
 
-        print("Читаю файлы...")
-        files = self.parse_files()
+            print("Читаю файлы...")
+            files = self.parse_files()
 
-        print("Ищу зависимости Maven...")
-        maven_deps = self.extract_maven_deps()
+            print("Ищу зависимости Maven...")
+            maven_deps = self.extract_maven_deps()
 
-        print("Ищу зависимости Gradle...")
-        gradle_deps = self.extract_gradle_deps()
+            print("Ищу зависимости Gradle...")
+            gradle_deps = self.extract_gradle_deps()
+
+            print("Ищу версии Java...")
+            java_versions = self.extract_java_versions()
+        finally:
+            # Клон удаляется и при ошибке разбора, иначе в сервисе копятся repo_tmp упавших заданий
+            if not self.local:
+                print("Удаляю локальный репозиторий...")
+                shutil.rmtree(self.temp_folder, ignore_errors=True)
 
         result = {
             "repository": self.repo_url,
@@ -144,20 +234,21 @@ class ParserJava:
                 "maven": maven_deps,
                 "gradle": gradle_deps
             },
+            "java_versions": java_versions,
         }
 
-        print("Удаляю локальный репозиторий...")
-        shutil.rmtree(self.temp_folder, ignore_errors=True)
-
         return result
 
-    # 6. Сохранение YAML
+    # 7. Сохранение YAML
+    @traced("java.save_yaml")
     def save_yaml(self, data, output="dependencies/repo_data.yaml"):
         with open(output, "w", encoding="utf-8") as f:
             yaml.dump(data, f, sort_keys=False, allow_unicode=True)
         print(f"YAML сохранён → {output}")
         
-    def save_gitlab_ci(self, data, output='.gitlab/workflows/gitlab-java.yml'):
+    @traced("java.write_gitlab_ci")
+    def save_gitlab_ci(self, data, output='.gitlab/workflows/gitlab-java.yml',
+                       java_versions=None, max_matrix=DEFAULT_MAX_MATRIX, java_version="17"):
 
         gitlab_ci = {
             "stages": ["build", "test", "deploy"],
@@ -171,12 +262,12 @@ class ParserJava:
         for module in gradle_modules:
             gitlab_ci[self.job_name(module)] = {
                 "stage": "build",
-                "image": "gradle:8.3-jdk17",
+                "image": GRADLE_IMAGE.format(java=java_version),
                 "script": [
                     f"./gradlew {module}:clean {module}:build --parallel"
                 ],
                 "artifacts": {
-                    "paths": [f"{module[1:]}/build/libs/"],
+                    "paths": [f"{self.module_dir(module)}/build/libs/*.jar"],
                     "expire_in": "1 hour"
                 }
             }
@@ -184,7 +275,7 @@ class ParserJava:
         if data.get("dependencies", {}).get("maven"):
             gitlab_ci["maven_build"] = {
                 "stage": "build",
-                "image": "maven:3.9.1-openjdk-17",
+                "image": MAVEN_IMAGE.format(java=java_version),
                 "script": ["mvn clean install -B"],
                 "artifacts": {
                     "paths": ["target/"],
@@ -194,7 +285,7 @@ class ParserJava:
 
         gitlab_ci["run_tests"] = {
             "stage": "test",
-            "image": "gradle:8.3-jdk17",
+            "image": GRADLE_IMAGE.format(java=java_version),
             "script": [
                 "./gradlew test --parallel --continue"
             ],
@@ -217,6 +308,15 @@ class ParserJava:
             "only": ["main"]
         }
 
+        # Матрица версий JDK для тестов
+        matrix = parallel_matrix({"JAVA_VERSION": java_versions or []}, max_matrix)
+        if matrix:
+            gitlab_ci["run_tests"]["image"] = GRADLE_IMAGE.format(java="${JAVA_VERSION}")
+            gitlab_ci["run_tests"]["parallel"] = matrix
+
+        gitlab_ci, report = optimize_pipeline(gitlab_ci)
+
         # Сохраняем красиво YAML
         with open(output, "w", encoding="utf-8") as f:
-            yaml.dump(gitlab_ci, f, sort_keys=False, allow_unicode=True)
\ No newline at end of file
+            yaml.dump(gitlab_ci, f, sort_keys=False, allow_unicode=True)
+        print(format_report(report))
\ No newline at end of file
@@ -0,0 +1,10 @@
+from parse_javascript.parser_javascript import ParserJavaScript
+
+
+def run(main):
+    parser_java_script = ParserJavaScript(path=main.path, local=main.local, ref=main.ref)
+    data = parser_java_script.parse_repo()
+    parser_java_script.save_to_yaml(data, output_file=main.out("dependencies/js_repo_analysis.yaml"))
+    node_versions = data["ci_config"]["node_versions"] if main.matrix else None
+    parser_java_script.generate_gitlab_ci(data, output_file=main.out(".gitlab/workflows/gitlab-js-ci.yml"),
+                                          node_versions=node_versions, max_matrix=main.max_matrix)
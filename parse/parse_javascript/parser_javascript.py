@@ -1,15 +1,21 @@
+import os
 import yaml
-import requests
 import base64
 import json
+from github_api import API_URL, get as http_get
+from pipeline.optimizer import optimize_pipeline, format_report
+from pipeline.matrix import NODE_VERSIONS, DEFAULT_MAX_MATRIX, supported_versions, minimum_version, parallel_matrix
+from tracing import traced
 
 class ParserJavaScript:
-    def __init__(self, path: str, token: str = None):
+    def __init__(self, path: str, token: str = None, local: bool = False, ref: str = None):
         self.path = path
+        self.local = local
         parts = path.rstrip("/").split("/")
         self.owner = parts[-2]
         self.repo = parts[-1]
-        self.api_base = f"https://api.github.com/repos/{self.owner}/{self.repo}/contents"
+        # Ссылки на файлы в ответе листинга уже содержат тот же ?ref
+        self.api_base = f"{API_URL}/repos/{self.owner}/{self.repo}/contents" + (f"?ref={ref}" if ref else "")
         
         self.headers = {}
         if token:
@@ -17,7 +23,11 @@ class ParserJavaScript:
 
     def _get_file_content(self, url):
         """Скачивает и декодирует содержимое файла."""
-        response = requests.get(url, headers=self.headers)
+        if self.local:
+            with open(url, "r", encoding="utf-8") as f:
+                return f.read()
+
+        response = http_get(url, headers=self.headers)
         if response.status_code == 200:
             data = response.json()
             # GitHub API возвращает контент в base64
@@ -27,7 +37,10 @@ class ParserJavaScript:
 
     def _fetch_root_files(self):
         """Получает список файлов только в корне (для анализа структуры)."""
-        response = requests.get(self.api_base, headers=self.headers)
+        if self.local:
+            return [{"name": name, "url": os.path.join(self.path, name)} for name in sorted(os.listdir(self.path))]
+
+        response = http_get(self.api_base, headers=self.headers)
         if response.status_code != 200:
             print(f"Ошибка API: {response.status_code}")
             return []
@@ -68,6 +81,7 @@ class ParserJavaScript:
 
         return stack_info
 
+    @traced("javascript.parse_repo")
     def parse_repo(self):
         print(f"Анализ репозитория: {self.owner}/{self.repo} ...")
         
@@ -88,6 +102,8 @@ class ParserJavaScript:
         # 2. Поиск и парсинг package.json
         pkg_json_data = {}
         node_version = "latest"  # fallback
+        node_engine = None
+        node_versions = []
         scripts_dict = {}
         dependencies = {}
         dev_dependencies = {}
@@ -110,7 +126,10 @@ class ParserJavaScript:
                     # Проверяем версию Node
                     engines = pkg_json_data.get("engines", {})
                     if "node" in engines:
-                        node_version = engines["node"]
+                        # engines.node — диапазон (">=18"), а для образа нужен тег: берём минимальную подходящую версию
+                        node_engine = engines["node"]
+                        node_versions = supported_versions(node_engine, NODE_VERSIONS)
+                        node_version = minimum_version(node_versions, node_engine, default="lts")
                         
                 except json.JSONDecodeError:
                     print("Ошибка парсинга package.json")
@@ -127,6 +146,8 @@ class ParserJavaScript:
                 "package_manager": package_manager,
                 "install_command": install_cmd,
                 "node_version": node_version,
+                "node_engine": node_engine,
+                "node_versions": node_versions,
                 "scripts": scripts_dict,
                 "dependencies": dependencies,
                 "dev_dependencies": dev_dependencies,
@@ -145,7 +166,9 @@ class ParserJavaScript:
             yaml.dump(data, f, allow_unicode=True, sort_keys=False)
         print(f"Анализ завершен. Результат в: {output_file}")
         
-    def generate_gitlab_ci(self, data, output_file=".gitlab/workflows/gitlab-js-ci.yml"):
+    @traced("javascript.write_gitlab_ci")
+    def generate_gitlab_ci(self, data, output_file=".gitlab/workflows/gitlab-js-ci.yml",
+                           node_versions=None, max_matrix=DEFAULT_MAX_MATRIX):
         ci = {
             "stages": ["install", "build", "test", "deploy"],
             "variables": {"NODE_VERSION": data["ci_config"]["node_version"]}
@@ -187,11 +210,21 @@ class ParserJavaScript:
             "only": ["main"]
         }
 
+        # Матрица версий Node для тестов
+        matrix = parallel_matrix({"NODE_VERSION": node_versions or []}, max_matrix)
+        if matrix and "test" in ci:
+            ci["test"]["image"] = "node:${NODE_VERSION}"
+            ci["test"]["parallel"] = matrix
+
+        ci, report = optimize_pipeline(ci)
+
         with open(output_file, "w", encoding="utf-8") as f:
             yaml.dump(ci, f, sort_keys=False, allow_unicode=True)
         print(f"GitLab CI создан: {output_file}")
+        print(format_report(report))
 
 
+    @traced("javascript.save_yaml")
     def save_to_yaml(self, data, output_file="dependencies/js_repo_analysis.yaml"):
         with open(output_file, "w", encoding="utf-8") as f:
             yaml.dump(data, f, allow_unicode=True, sort_keys=False)
@@ -1,13 +1,21 @@
-import requests
 import yaml
 import sys
 import re
 import os
-from dotenv import load_dotenv
-
-load_dotenv()
-
-GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
+import glob
+from github_api import API_URL, get as http_get
+from pipeline.optimizer import optimize_pipeline, format_report
+from parse_python.package_index import PackageIndex, normalize_name
+from pipeline.matrix import PYTHON_VERSIONS, DEFAULT_MAX_MATRIX, parse_python_requires, supported_versions, parallel_matrix
+from tracing import traced
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
 
 def parse_github_url(url: str):
     match = re.search(r"github\.com/([^/]+)/([^/]+)", url)
@@ -16,6 +24,34 @@ def parse_github_url(url: str):
     return match.group(1), match.group(2).replace(".git", "")
 
 
+def _get_headers():
+    return {
+        "Accept": "application/vnd.github+json",
+        "Authorization": f"Bearer {os.getenv('GITHUB_TOKEN')}",
+        "X-GitHub-Api-Version": "2022-11-28"
+    }
+
+
+def get_repo_file(owner, repo, path, ref=None):
+    """Сырое содержимое файла из репозитория (на коммите ref, иначе ветка по умолчанию) или None, если файла нет."""
+    headers = {**_get_headers(), "Accept": "application/vnd.github.raw+json"}
+    url = f"{API_URL}/repos/{owner}/{repo}/contents/{path}" + (f"?ref={ref}" if ref else "")
+    response = http_get(url, headers=headers)
+    if response.status_code != 200:
+        return None
+    return response.text
+
+
+@traced("python.versions")
+def get_python_versions(owner, repo, ref=None):
+    """Поддерживаемые версии Python по python_requires / requires-python."""
+    for path in ("pyproject.toml", "setup.cfg", "setup.py"):
+        spec = parse_python_requires(get_repo_file(owner, repo, path, ref))
+        if spec:
+            return supported_versions(spec, PYTHON_VERSIONS)
+    return []
+
+
 def is_python_package(name: str) -> bool:
     if "/" in name:
         return False
@@ -30,16 +66,35 @@ def is_python_package(name: str) -> bool:
     return re.match(r"^[a-zA-Z0-9._-]+$", name) is not None
 
 
+def exact_version(version) -> str:
+    """Версия, пригодная для пина (1.2.3, 2.0rc1), иначе пустая строка для диапазонов/мусора."""
+    if not isinstance(version, str):
+        return ""
+    version = version.strip().lstrip("=").strip()
+    if re.match(r"^\d+(\.\d+)*([a-zA-Z0-9.+!-]*)$", version):
+        return version
+    return ""
+
+
+def _merge_deps(raw_deps: list) -> list:
+    """(имя, версия) без дублей (Requests и requests — один пакет по PEP 503); непустая версия приоритетнее."""
+    found = {}
+    for name, version in raw_deps:
+        if not is_python_package(name):
+            continue
+        key = normalize_name(name)
+        first_name, first_version = found.get(key, (name, ""))
+        found[key] = (first_name, first_version or exact_version(version))
+    return [found[key] for key in sorted(found)]
+
+
+@traced("python.sbom")
 def get_dependencies(owner, repo):
     print(owner, repo)
-    headers = {
-        "Accept": "application/vnd.github+json",
-        "Authorization": f"Bearer {GITHUB_TOKEN}",
-        "X-GitHub-Api-Version": "2022-11-28"
-    }
+    headers = _get_headers()
 
-    url = f"https://api.github.com/repos/{owner}/{repo}/dependency-graph/sbom"
-    response = requests.get(url, headers=headers)
+    url = f"{API_URL}/repos/{owner}/{repo}/dependency-graph/sbom"
+    response = http_get(url, headers=headers)
 
     if response.status_code != 200:
         raise Exception(f"GitHub API error: {response.status_code}\n{response.text}")
@@ -59,49 +114,204 @@ def get_dependencies(owner, repo):
     for comp in components:
         name = comp.get("name")
         if name:
-            raw_deps.append(name)
+            raw_deps.append((name, comp.get("version")))
 
 
     for pkg in packages:
         name = pkg.get("name")
         if name:
-            raw_deps.append(name)
+            raw_deps.append((name, pkg.get("versionInfo")))
 
-    clean = sorted({d for d in raw_deps if is_python_package(d)})
+    return _merge_deps(raw_deps)
 
-    return clean
 
+# -----------------------
+# ЛОКАЛЬНЫЙ CHECKOUT
+# -----------------------
+def _requirement_lines(text: str) -> list:
+    """Строки requirements-файла со склеенными продолжениями через \\ (вывод pip-compile --generate-hashes)."""
+    return re.sub(r"\\\r?\n", " ", text).splitlines()
 
-def write_env_yml(deps: list, out_file="dependencies/environment.yml"):
+
+def _parse_requirement(line: str):
+    """
+    'requests==2.31.0 ; python_version>"3"' -> ('requests', '2.31.0').
+    Опции pip после спецификации (--hash=...) отбрасываются; VCS/URL-зависимости
+    берутся только по #egg= или 'name @ url', остальные пропускаются.
+    """
+    # Комментарий в pip начинается с # в начале строки или после пробела (#egg= внутри URL — не комментарий)
+    line = re.sub(r"(^|\s)#.*$", "", line).strip()
+    if not line or line.startswith("-"):
+        return None
+
+    direct = re.match(r"^([A-Za-z0-9][A-Za-z0-9._-]*)(\[[^\]]*\])?\s*@", line)
+    if direct:
+        return direct.group(1), ""
+    if "://" in line or re.match(r"^(git|hg|svn|bzr)\+", line):
+        egg = re.search(r"#egg=([A-Za-z0-9][A-Za-z0-9._-]*)", line)
+        return (egg.group(1), "") if egg else None
+
+    line = re.split(r"\s+-", line.split(";", 1)[0], 1)[0].strip()
+    m = re.match(r"^([A-Za-z0-9][A-Za-z0-9._-]*)(\[[^\]]*\])?\s*(===?\s*([^\s,]+))?\s*$", line)
+    if not m:
+        m = re.match(r"^([A-Za-z0-9][A-Za-z0-9._-]*)", line)
+        return (m.group(1), "") if m else None
+    return m.group(1), m.group(4) or ""
+
+
+def _read_pyproject(path: str) -> dict:
+    pyproject = os.path.join(path, "pyproject.toml")
+    if not os.path.exists(pyproject):
+        return {}
+    if tomllib is None:
+        print("[WARN] pyproject.toml пропущен: на Python < 3.11 нужен пакет tomli (pip install tomli)")
+        return {}
+    with open(pyproject, "rb") as f:
+        return tomllib.load(f)
+
+
+@traced("python.local_deps")
+def get_local_dependencies(path: str):
+    """Зависимости из requirements*.txt и pyproject.toml локального checkout (без SBOM)."""
+    raw_deps = []
+
+    for req_file in sorted(glob.glob(os.path.join(path, "requirements*.txt"))):
+        with open(req_file, "r", encoding="utf-8") as f:
+            for line in _requirement_lines(f.read()):
+                req = _parse_requirement(line)
+                if req:
+                    raw_deps.append(req)
+
+    pyproject = _read_pyproject(path)
+    project = pyproject.get("project", {})
+    specs = list(project.get("dependencies", []))
+    for extra in project.get("optional-dependencies", {}).values():
+        specs.extend(extra)
+    for spec in specs:
+        req = _parse_requirement(spec)
+        if req:
+            raw_deps.append(req)
+
+    poetry = pyproject.get("tool", {}).get("poetry", {}).get("dependencies", {})
+    raw_deps.extend((name, spec) for name, spec in poetry.items() if name.lower() != "python")
+
+    return _merge_deps(raw_deps)
+
+
+def get_local_python_versions(path: str):
+    """Поддерживаемые версии Python по файлам локального checkout."""
+    for name in ("pyproject.toml", "setup.cfg", "setup.py"):
+        file_path = os.path.join(path, name)
+        if not os.path.exists(file_path):
+            continue
+        with open(file_path, "r", encoding="utf-8") as f:
+            spec = parse_python_requires(f.read())
+        if spec:
+            return supported_versions(spec, PYTHON_VERSIONS)
+    return []
+
+
+# -----------------------
+# ПИНЫ ВЕРСИЙ
+# -----------------------
+def get_package_index(index_url=None, cache_dir=None, ttl=None):
+    """
+    Индекс для проверки пинов: явный URL или PYPI_INDEX_URL (локальное зеркало / https://pypi.org/pypi).
+    Без URL проверка пропускается, и версии из SBOM используются как есть.
+    """
+    index_url = index_url or os.getenv("PYPI_INDEX_URL")
+    if not index_url:
+        return None
+    return PackageIndex(
+        index_url,
+        cache_dir=cache_dir or os.getenv("PACKAGE_INDEX_CACHE", ".cache/package_index"),
+        ttl=int(ttl if ttl is not None else os.getenv("PACKAGE_INDEX_TTL", 24 * 60 * 60)),
+    )
+
+
+def pin_dependencies(deps: list, index: PackageIndex = None) -> list:
+    """
+    Превращает (имя, версия) в спецификации pip: 'name==version'.
+    Если задан индекс, версия пинится только когда она там опубликована
+    (при недоступном индексе пин из SBOM остаётся непроверенным).
+    """
+    specs = []
+    for name, version in deps:
+        if version and (index is None or index.has_version(name, version) is not False):
+            specs.append(f"{name}=={version}")
+        else:
+            specs.append(name)
+    return specs
+
+
+@traced("python.write_lock")
+def write_requirements_lock(deps: list, index: PackageIndex, out_file="dependencies/requirements.lock"):
+    """
+    requirements-файл с хешами для pip install --require-hashes (только пинованные пакеты).
+    Пакеты без пина или хешей перечисляются в шапке файла и в выводе, чтобы неполный lock было видно.
+    """
+    lines = []
+    skipped = []
+    for name, version in deps:
+        hashes = index.hashes(name, version) if version else []
+        if not hashes:
+            skipped.append(normalize_name(name))
+            continue
+        lines.append(f"{normalize_name(name)}=={version} \\\n")
+        lines.append(" \\\n".join(f"    --hash=sha256:{h}" for h in hashes) + "\n")
+
+    if skipped:
+        header = ["# Не вошли в lock (нет пина версии или хешей в индексе):\n"]
+        header += [f"#   {name}\n" for name in skipped]
+        lines = header + lines
+
+    with open(out_file, "w", encoding="utf-8") as f:
+        f.writelines(lines)
+
+    print(f"[OK] Файл {out_file} создан. Без пина/хешей пропущено: {len(skipped)}")
+    if skipped:
+        print("[WARN] Не вошли в lock: " + ", ".join(skipped))
+
+
+@traced("python.write_env_yml")
+def write_env_yml(deps: list, out_file="dependencies/environment.yml", index: PackageIndex = None,
+                  python_version="3.10"):
+    specs = pin_dependencies(deps, index)
     env = {
         "name": "auto_env",
         "dependencies": [
-            "python=3.10",
+            f"python={python_version}",
             "pip",
-            {"pip": deps}
+            {"pip": specs}
         ]
     }
 
     with open(out_file, "w") as f:
         yaml.dump(env, f, sort_keys=False, allow_unicode=True)
 
+    pinned = sum(1 for s in specs if "==" in s)
     print(f"\n[OK] Файл {out_file} создан.")
-    print(f"Найдено Python-зависимостей: {len(deps)}")
+    print(f"Найдено Python-зависимостей: {len(deps)}, из них с пином версии: {pinned}")
+    if index is not None:
+        print(f"Кэш метаданных индекса: попаданий {index.hits}, запросов {index.misses}, ошибок {index.errors}")
 
-def write_gitlab_ci_yml(out_file=".gitlab/workflows/gitlab-ci-py.yml"):
+@traced("python.write_gitlab_ci")
+def write_gitlab_ci_yml(out_file=".gitlab/workflows/gitlab-ci-py.yml", python_versions=None, max_matrix=DEFAULT_MAX_MATRIX,
+                        python_version="3.10"):
     """
     Создает базовый шаблон GitLab CI/CD для Python-проекта
     с использованием environment.yml (conda) или pip.
+    Если передан python_versions, тесты запускаются параллельно по матрице версий.
     """
 
     gitlab_ci = {
         "stages": ["setup", "test", "deploy"],
         "variables": {
-            "PYTHON_VERSION": "3.10"
+            "PYTHON_VERSION": python_version
         },
         "setup_env": {
             "stage": "setup",
-            "image": "python:3.10-slim",
+            "image": f"python:{python_version}-slim",
             "before_script": [
                 "pip install --upgrade pip",
                 "pip install pyyaml"
@@ -117,7 +327,7 @@ def write_gitlab_ci_yml(out_file=".gitlab/workflows/gitlab-ci-py.yml"):
         },
         "run_tests": {
             "stage": "test",
-            "image": "python:3.10-slim",
+            "image": f"python:{python_version}-slim",
             "script": [
                 "echo 'Запуск тестов'",
                 "pytest || true"
@@ -126,7 +336,7 @@ def write_gitlab_ci_yml(out_file=".gitlab/workflows/gitlab-ci-py.yml"):
         },
         "deploy": {
             "stage": "deploy",
-            "image": "python:3.10-slim",
+            "image": f"python:{python_version}-slim",
             "script": [
                 "echo 'Деплой (пример)'"
             ],
@@ -135,13 +345,24 @@ def write_gitlab_ci_yml(out_file=".gitlab/workflows/gitlab-ci-py.yml"):
         }
     }
 
+    matrix = parallel_matrix({"PYTHON_VERSION": python_versions or []}, max_matrix)
+    if matrix:
+        gitlab_ci["run_tests"]["image"] = "python:${PYTHON_VERSION}-slim"
+        gitlab_ci["run_tests"]["parallel"] = matrix
+
+    gitlab_ci, report = optimize_pipeline(gitlab_ci)
+
     with open(out_file, "w") as f:
         yaml.dump(gitlab_ci, f, sort_keys=False)
 
     print(f"[OK] {out_file} создан")
+    print(format_report(report))
 
 
 if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv()
+
     if len(sys.argv) != 2:
         print("Использование:")
         print("  python autogen_env.py https://github.com/user/repo")
@@ -0,0 +1,37 @@
+from parse_python.autogen_env import (
+    parse_github_url, get_dependencies, get_python_versions, get_local_dependencies, get_local_python_versions,
+    get_package_index, write_env_yml, write_requirements_lock, write_gitlab_ci_yml
+)
+from pipeline.matrix import minimum_version
+
+DEFAULT_PYTHON_VERSION = "3.10"
+
+
+def write_python_env(main, deps, python_version=DEFAULT_PYTHON_VERSION):
+    index = main.package_index or get_package_index(main.index_url)
+    write_env_yml(deps, out_file=main.out("dependencies/environment.yml"), index=index,
+                  python_version=python_version)
+    if main.lock:
+        if index is None:
+            print("Для requirements.lock нужен индекс пакетов: задайте --index-url или PYPI_INDEX_URL")
+        else:
+            write_requirements_lock(deps, index, out_file=main.out("dependencies/requirements.lock"))
+
+
+def run(main):
+    if main.local:
+        print(f"→ Чтение зависимостей из checkout: {main.path} ...")
+        deps = get_local_dependencies(main.path)
+        python_versions = get_local_python_versions(main.path)
+    else:
+        owner, repo = parse_github_url(main.path)
+        print(f"→ Получение SBOM из GitHub для: {owner}/{repo} ...")
+        deps = get_dependencies(owner, repo)
+        main.uses_default_branch("sbom")
+        python_versions = get_python_versions(owner, repo, ref=main.ref)
+
+    # environment.yml и setup_env — на минимальной версии из requires-python, матрица — только для тестов
+    python_version = minimum_version(python_versions, default=DEFAULT_PYTHON_VERSION)
+    write_python_env(main, deps, python_version)
+    write_gitlab_ci_yml(out_file=main.out(".gitlab/workflows/gitlab-ci-py.yml"), python_version=python_version,
+                        python_versions=python_versions if main.matrix else None, max_matrix=main.max_matrix)
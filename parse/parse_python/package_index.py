@@ -0,0 +1,129 @@
+import os
+import re
+import json
+import time
+import threading
+import requests
+from collections import OrderedDict
+from tracing import span, count
+
+DEFAULT_CACHE_DIR = ".cache/package_index"
+DEFAULT_TTL = 24 * 60 * 60
+# Сколько пакетов держать в памяти: в сервисе один индекс живёт между всеми заданиями
+MEMORY_ENTRIES = 4096
+
+
+def normalize_name(name: str) -> str:
+    """Нормализация имени пакета по PEP 503."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+class PackageIndex:
+    """
+    Слой метаданных поверх PyPI JSON API (или локального зеркала с тем же API).
+    Ответы хранятся на диске и в памяти (LRU) и переиспользуются, пока не истёк TTL.
+    """
+
+    def __init__(self, index_url: str, cache_dir: str = DEFAULT_CACHE_DIR, ttl: int = DEFAULT_TTL):
+        self.index_url = index_url.rstrip("/")
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.session = requests.Session()
+        self.memory = OrderedDict()  # имя -> (fetched_at, releases)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def _cache_path(self, name: str) -> str:
+        return os.path.join(self.cache_dir, f"{normalize_name(name)}.json")
+
+    def _read_cache(self, name: str):
+        path = self._cache_path(name)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if self._expired(entry.get("fetched_at", 0)):
+            return None
+        return entry["fetched_at"], entry["releases"]
+
+    def _write_cache(self, name: str, fetched_at: float, releases: dict):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self._cache_path(name), "w", encoding="utf-8") as f:
+            json.dump({"fetched_at": fetched_at, "releases": releases}, f)
+
+    def _expired(self, fetched_at: float) -> bool:
+        return time.time() - fetched_at > self.ttl
+
+    def _remember(self, key: str, fetched_at: float, releases: dict):
+        with self.lock:
+            self.memory[key] = (fetched_at, releases)
+            self.memory.move_to_end(key)
+            while len(self.memory) > MEMORY_ENTRIES:
+                self.memory.popitem(last=False)
+
+    def _fetch(self, name: str):
+        """
+        {версия: [sha256 файлов релиза]}, {} если пакета нет в индексе,
+        или None, если индекс недоступен / ответил ошибкой (пин остаётся непроверенным).
+        """
+        try:
+            with span("package_index.fetch", package=name):
+                response = self.session.get(f"{self.index_url}/{normalize_name(name)}/json", timeout=30)
+            count("http.requests")
+            count("http.bytes", len(response.content))
+            if response.status_code == 404:
+                return {}
+            if response.status_code != 200:
+                raise requests.HTTPError(f"HTTP {response.status_code}")
+            data = response.json()
+        except (requests.RequestException, ValueError) as e:
+            self.errors += 1
+            count("package_index.errors")
+            print(f"[WARN] Индекс пакетов недоступен для {name}: {e} — версия не проверена")
+            return None
+
+        releases = {}
+        for version, files in data.get("releases", {}).items():
+            releases[version] = [f["digests"]["sha256"] for f in files if f.get("digests", {}).get("sha256")]
+        return releases
+
+    def releases(self, name: str):
+        """Релизы пакета или None, если индекс сейчас недоступен (ошибки не кэшируются)."""
+        key = normalize_name(name)
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry is not None and self._expired(entry[0]):
+                del self.memory[key]
+                entry = None
+            if entry is not None:
+                self.memory.move_to_end(key)
+        if entry is None:
+            entry = self._read_cache(name)
+
+        if entry is None:
+            self.misses += 1
+            count("package_index.cache_misses")
+            releases = self._fetch(name)
+            if releases is None:
+                return None
+            entry = (time.time(), releases)
+            self._write_cache(name, *entry)
+        else:
+            self.hits += 1
+            count("package_index.cache_hits")
+
+        self._remember(key, *entry)
+        return entry[1]
+
+    def has_version(self, name: str, version: str):
+        """True/False, или None, если проверить не удалось."""
+        releases = self.releases(name)
+        return None if releases is None else version in releases
+
+    def hashes(self, name: str, version: str) -> list:
+        return (self.releases(name) or {}).get(version, [])
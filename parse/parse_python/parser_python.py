@@ -1,5 +1,6 @@
 import yaml
-import requests
+from github_api import API_URL, get as http_get
+from tracing import traced
 
 class ParserPython:
     def __init__(self, path: str):
@@ -9,10 +10,10 @@ class ParserPython:
         self.owner = parts[-2]
         self.repo = parts[-1]
 
-        self.api_base = f"https://api.github.com/repos/{self.owner}/{self.repo}/contents"
+        self.api_base = f"{API_URL}/repos/{self.owner}/{self.repo}/contents"
     
     def _fetch_dir(self, url, parent=""):
-        response = requests.get(url)
+        response = http_get(url)
         if response.status_code != 200:
             print(f"Ошибка API: {response.status_code} → {url}")
             return []
@@ -35,6 +36,7 @@ class ParserPython:
 
         return files
     
+    @traced("python.parse_repo")
     def parse_repo(self):
         """Главный метод — как в твоём классе ParserPython."""
         repo_data = {
@@ -43,6 +45,7 @@ class ParserPython:
         }
         return repo_data
     
+    @traced("python.save_yaml")
     def save_to_yaml(self, data, output_file="repo_data.yaml"):
         with open(output_file, "w", encoding="utf-8") as f:
             yaml.dump(data, f, allow_unicode=True, sort_keys=False)
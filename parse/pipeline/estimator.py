@@ -0,0 +1,326 @@
+import os
+import re
+import glob
+import heapq
+import json
+import yaml
+from xml.etree import ElementTree
+
+from pipeline.optimizer import get_jobs, job_instances
+
+# Грубые оценки длительности джоб в секундах: база по типу джобы плюс надбавки по размеру репозитория
+JOB_OVERHEAD = 15  # pull образа, старт раннера, checkout
+BASE_SECONDS = {"lint": 30, "install": 45, "build": 60, "test": 60, "deploy": 20, "other": 30}
+PER_DEPENDENCY = 0.5
+PER_MODULE = 20
+PER_TEST_FILE = 2
+
+# Тип джобы по стадии или имени
+KIND_PATTERNS = [
+    ("lint", r"lint|vet|fmt|check"),
+    ("install", r"install|setup|deps"),
+    ("build", r"build|compile|package"),
+    ("test", r"test"),
+    ("deploy", r"deploy|release|publish"),
+]
+
+# Джобы, которые запускаются не в каждом пайплайне: вручную/по таймеру или только на части веток
+OPTIONAL_WHEN = {"manual", "delayed", "never"}
+OPTIONAL_KEYS = ("only", "except", "rules")
+
+TEST_FILE_PATTERNS = [r"^test_.*\.py$", r".*_test\.py$", r".*_test\.go$", r".*Tests?\.java$",
+                      r".*\.(test|spec)\.[jt]sx?$"]
+SKIP_DIRS = {".git", "node_modules", "vendor", ".venv", "venv", "build", "target", "dist"}
+
+
+def job_kind(name: str, job: dict) -> str:
+    for value in (job.get("stage", ""), name):
+        for kind, pattern in KIND_PATTERNS:
+            if re.search(pattern, value or "", re.IGNORECASE):
+                return kind
+    return "other"
+
+
+def optional_jobs(ci: dict) -> dict:
+    """
+    {джоба: причина} для джоб, которых может не быть в обычном пайплайне (when: manual, only: [main]),
+    и для джоб, ждущих их через needs. В граф и время пайплайна они не входят.
+    """
+    jobs = get_jobs(ci)
+    optional = {}
+    for name, job in jobs.items():
+        if job.get("when") in OPTIONAL_WHEN:
+            optional[name] = f"when: {job['when']}"
+        else:
+            key = next((key for key in OPTIONAL_KEYS if key in job), None)
+            if key:
+                optional[name] = key
+
+    changed = True
+    while changed:
+        changed = False
+        for name, job in jobs.items():
+            needs = [n["job"] if isinstance(n, dict) else n for n in job.get("needs") or []]
+            upstream = next((n for n in needs if n in optional), None)
+            if name not in optional and upstream:
+                optional[name] = f"needs {upstream}"
+                changed = True
+    return optional
+
+
+# -----------------------
+# СИГНАЛЫ РАЗМЕРА
+# -----------------------
+def _load_yaml(path: str) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f) or {}
+
+
+def scan_signals(scan_file: str = None, checkout: str = None) -> dict:
+    """
+    Сигналы размера репозитория (модули, зависимости, тестовые файлы) из результата
+    сканирования и, если передан локальный checkout, число тестовых файлов на диске.
+    """
+    signals = {"modules": 1, "dependencies": 0, "test_files": 0}
+    name = os.path.basename(scan_file or "")
+
+    if name == "go.mod" and os.path.exists(scan_file):
+        with open(scan_file, "r", encoding="utf-8") as f:
+            signals["dependencies"] = sum(1 for line in f if line.startswith("\t"))
+    elif name.endswith((".yaml", ".yml")):
+        data = _load_yaml(scan_file)
+        if "ci_config" in data:  # js_repo_analysis.yaml
+            ci_config = data["ci_config"]
+            signals["dependencies"] = len(ci_config.get("dependencies") or {}) + len(ci_config.get("dev_dependencies") or {})
+        elif "repository" in data:  # repo_data.yaml (Java)
+            deps = data.get("dependencies") or {}
+            gradle = deps.get("gradle") or []
+            modules = [d for d in gradle if d.startswith(":")]
+            signals["modules"] = max(1, len(modules))
+            signals["dependencies"] = len(gradle) - len(modules) + len(deps.get("maven") or [])
+        else:  # environment.yml
+            for item in data.get("dependencies") or []:
+                if isinstance(item, dict):
+                    signals["dependencies"] += len(item.get("pip") or [])
+
+    if checkout:
+        signals["test_files"] = count_test_files(checkout)
+    return signals
+
+
+def count_test_files(path: str) -> int:
+    patterns = [re.compile(p) for p in TEST_FILE_PATTERNS]
+    total = 0
+    for root, dirs, files in os.walk(path):
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+        total += sum(1 for name in files if any(p.match(name) for p in patterns))
+    return total
+
+
+# -----------------------
+# ИСТОРИЧЕСКИЕ ДАННЫЕ
+# -----------------------
+def load_junit_seconds(junit_dir: str) -> float:
+    """Суммарное время тестов по JUnit XML (testsuite/@time, иначе сумма testcase/@time)."""
+    total = 0.0
+    for path in glob.glob(os.path.join(junit_dir, "**", "*.xml"), recursive=True):
+        try:
+            root = ElementTree.parse(path).getroot()
+        except ElementTree.ParseError:
+            continue
+        suites = [root] if root.tag == "testsuite" else root.findall(".//testsuite")
+        for suite in suites:
+            if suite.get("time"):
+                total += float(suite.get("time"))
+            else:
+                total += sum(float(case.get("time", 0)) for case in suite.findall("testcase"))
+    return total
+
+
+def load_timings(path: str) -> dict:
+    """{имя джобы: секунды} из JSON (например, выгрузка длительностей прошлых пайплайнов)."""
+    with open(path, "r", encoding="utf-8") as f:
+        return {name: float(seconds) for name, seconds in json.load(f).items()}
+
+
+# -----------------------
+# ГРАФ И ДЛИТЕЛЬНОСТИ
+# -----------------------
+def build_dag(ci: dict) -> dict:
+    """
+    {джоба: [джобы, которые должны завершиться раньше]} по stages, needs и dependencies.
+    Необязательные джобы (optional_jobs) в граф не попадают.
+    """
+    optional = optional_jobs(ci)
+    jobs = {name: job for name, job in get_jobs(ci).items() if name not in optional}
+    stages = ci.get("stages") or ["build", "test", "deploy"]
+    dag = {}
+
+    for name, job in jobs.items():
+        if "needs" in job:
+            upstream = [n["job"] if isinstance(n, dict) else n for n in job["needs"]]
+        else:
+            stage = job.get("stage", "test")
+            index = stages.index(stage) if stage in stages else len(stages)
+            upstream = [other for other, other_job in jobs.items()
+                        if other_job.get("stage", "test") in stages[:index]]
+        upstream += job.get("dependencies", []) or []
+        dag[name] = sorted({u for u in upstream if u in jobs and u != name})
+    return dag
+
+
+def estimate_durations(ci: dict, signals: dict, junit_seconds: float = 0, timings: dict = None) -> dict:
+    jobs = get_jobs(ci)
+    timings = timings or {}
+    kinds = {name: job_kind(name, job) for name, job in jobs.items()}
+    per_kind = {kind: sum(1 for k in kinds.values() if k == kind) for kind in BASE_SECONDS}
+
+    durations = {}
+    for name, kind in kinds.items():
+        if name in timings:
+            durations[name] = timings[name]
+            continue
+
+        seconds = JOB_OVERHEAD + BASE_SECONDS[kind]
+        if kind == "install":
+            seconds += PER_DEPENDENCY * signals["dependencies"]
+        elif kind == "build":
+            seconds += PER_MODULE * signals["modules"] / per_kind["build"]
+            if not per_kind["install"]:
+                seconds += PER_DEPENDENCY * signals["dependencies"]
+        elif kind == "test":
+            if junit_seconds:
+                seconds += junit_seconds / per_kind["test"]
+            else:
+                seconds += PER_TEST_FILE * signals["test_files"] / per_kind["test"]
+        durations[name] = seconds
+    return durations
+
+
+def _topological(dag: dict) -> list:
+    order, visited, visiting = [], set(), set()
+
+    def visit(name):
+        if name in visited:
+            return
+        if name in visiting:
+            raise ValueError(f"Цикл в графе джоб: {name}")
+        visiting.add(name)
+        for up in dag[name]:
+            visit(up)
+        visiting.discard(name)
+        visited.add(name)
+        order.append(name)
+
+    for name in dag:
+        visit(name)
+    return order
+
+
+def critical_path(dag: dict, durations: dict):
+    """(путь, длительность) — самая длинная цепочка при неограниченном числе раннеров."""
+    finish, previous = {}, {}
+    for name in _topological(dag):
+        start = max((finish[up] for up in dag[name]), default=0)
+        previous[name] = max(dag[name], key=lambda up: finish[up]) if dag[name] else None
+        finish[name] = start + durations[name]
+
+    if not finish:
+        return [], 0
+    node = max(finish, key=finish.get)
+    total = finish[node]
+    path = []
+    while node:
+        path.append(node)
+        node = previous[node]
+    return path[::-1], total
+
+
+def simulate(dag: dict, durations: dict, instances: dict, runners: int = None):
+    """
+    Раскладывает экземпляры джоб по раннерам (list scheduling, как раздаёт GitLab)
+    и возвращает (время пайплайна, профиль параллелизма [(время, активных джоб)]).
+    """
+    finish = {}
+    free_at = [0.0] * runners if runners else None  # когда освободится каждый раннер
+    intervals = []
+
+    order = _topological(dag)
+    pending = list(order)
+    while pending:
+        # Следующей запускается джоба, которая раньше всех готова к старту
+        candidates = [n for n in pending if all(up in finish for up in dag[n])]
+        name = min(candidates, key=lambda n: max((finish[up] for up in dag[n]), default=0))
+        pending.remove(name)
+        ready = max((finish[up] for up in dag[name]), default=0)
+        ends = []
+        for _ in range(instances.get(name, 1)):
+            start = ready
+            if free_at is not None:
+                start = max(ready, heapq.heappop(free_at))
+            end = start + durations[name]
+            if free_at is not None:
+                heapq.heappush(free_at, end)
+            intervals.append((start, end))
+            ends.append(end)
+        finish[name] = max(ends)
+
+    events = sorted([(s, 1) for s, _ in intervals] + [(e, -1) for _, e in intervals], key=lambda ev: (ev[0], ev[1]))
+    profile, active = [], 0
+    for time_point, delta in events:
+        active += delta
+        if profile and profile[-1][0] == time_point:
+            profile[-1] = (time_point, active)
+        else:
+            profile.append((time_point, active))
+    return max(finish.values(), default=0), profile
+
+
+def analyze(ci: dict, signals: dict, junit_seconds: float = 0, timings: dict = None, runners: int = None) -> dict:
+    dag = build_dag(ci)
+    durations = estimate_durations(ci, signals, junit_seconds, timings)
+    instances = {name: job_instances(job) for name, job in get_jobs(ci).items()}
+    optional = optional_jobs(ci)
+    path, path_seconds = critical_path(dag, durations)
+    wall_seconds, profile = simulate(dag, durations, instances, runners)
+
+    busy = sum(durations[name] * instances[name] for name in dag)
+    return {
+        "jobs": {name: {"seconds": round(durations[name], 1), "instances": instances[name], "needs": dag[name]}
+                 for name in dag},
+        "optional_jobs": {name: {"seconds": round(durations[name], 1), "instances": instances[name], "reason": reason}
+                          for name, reason in optional.items()},
+        "critical_path": path,
+        "critical_path_seconds": round(path_seconds, 1),
+        "wall_seconds": round(wall_seconds, 1),
+        "runners": runners,
+        "max_parallelism": max((active for _, active in profile), default=0),
+        "avg_parallelism": round(busy / wall_seconds, 2) if wall_seconds else 0,
+        "parallelism_profile": [[round(t, 1), active] for t, active in profile],
+        "signals": signals,
+    }
+
+
+def format_analysis(name: str, result: dict) -> str:
+    minutes = lambda s: f"{s / 60:.1f} мин"
+    lines = [
+        f"== {name}",
+        f"Оценка времени пайплайна: {minutes(result['wall_seconds'])}"
+        + (f" (раннеров: {result['runners']})" if result["runners"] else ""),
+        f"Критический путь ({minutes(result['critical_path_seconds'])}): " + " → ".join(result["critical_path"]),
+        f"Параллелизм: максимум {result['max_parallelism']}, в среднем {result['avg_parallelism']}",
+    ]
+    width = max((len(job) for job in result["jobs"]), default=0)
+    for job, info in sorted(result["jobs"].items(), key=lambda kv: -kv[1]["seconds"]):
+        suffix = f" ×{info['instances']}" if info["instances"] > 1 else ""
+        lines.append(f"  {job:<{width}} {info['seconds']:>7.0f} с{suffix}")
+    optional = result.get("optional_jobs") or {}
+    if optional:
+        lines.append("Не входят в оценку (запускаются не в каждом пайплайне):")
+        width = max(len(job) for job in optional)
+        for job, info in sorted(optional.items()):
+            suffix = f" ×{info['instances']}" if info["instances"] > 1 else ""
+            lines.append(f"  {job:<{width}} {info['seconds']:>7.0f} с{suffix}  ({info['reason']})")
+    return "\n".join(lines)
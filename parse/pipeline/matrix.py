@@ -0,0 +1,241 @@
+import re
+from itertools import product
+
+# Поддерживаемые версии тулчейнов, из которых выбирается матрица (от старых к новым)
+PYTHON_VERSIONS = ["3.8", "3.9", "3.10", "3.11", "3.12", "3.13"]
+GO_VERSIONS = ["1.20", "1.21", "1.22", "1.23"]
+NODE_VERSIONS = ["18", "20", "22"]
+JAVA_VERSIONS = ["11", "17", "21"]
+
+DEFAULT_MAX_MATRIX = 6
+
+
+def _version_tuple(v: str) -> tuple:
+    return tuple(int(p) for p in re.findall(r"\d+", v))
+
+
+def _fit(bound: tuple, size: int) -> tuple:
+    """Приводит границу к длине версии-кандидата (3.8.1 -> 3.8, 4 -> 4.0)."""
+    return (bound + (0,) * size)[:size]
+
+
+def _satisfies(candidate: str, clause: str) -> bool:
+    clause = clause.strip()
+    if not clause or clause in ("*", "x"):
+        return True
+
+    m = re.match(r"^(>=|<=|==|!=|~=|>|<|\^|~|=)?\s*v?([\d.]+)(\.\*|\.x)?$", clause)
+    if not m:
+        return True
+    op, raw, wildcard = m.group(1) or "==", m.group(2).rstrip("."), m.group(3)
+
+    cand = _version_tuple(candidate)
+    bound = _version_tuple(raw)
+    fitted = _fit(bound, len(cand))
+
+    if op == "^":
+        # совместимый релиз: не ниже bound и тот же major
+        return cand >= fitted and cand[0] == bound[0]
+    if op in ("~=", "~"):
+        # PEP 440: ~=3.9.1 -> >=3.9.1, ==3.9.*; npm/poetry: ~1.2.3 -> >=1.2.3, 1.2.x; ~1 -> 1.x
+        prefix = max(len(bound) - 1, 1) if op == "~=" else min(len(bound), 2)
+        return cand >= fitted and _fit(cand, prefix) == bound[:prefix]
+    if op in ("==", "="):
+        if wildcard or len(bound) <= len(cand):
+            return cand[:len(bound)] == bound
+        return cand == fitted
+    if op == "!=":
+        return cand[:len(bound)] != bound
+    if op == ">=":
+        return cand >= fitted
+    if op == "<=":
+        return cand <= fitted
+    if op == ">":
+        return cand > fitted or (len(bound) > len(cand) and cand == fitted)
+    if op == "<":
+        return cand < fitted
+    return True
+
+
+def _hyphen_clauses(low: str, high: str) -> list:
+    """
+    npm "A - B": >=A и верхняя граница по правилам npm —
+    полная версия включительно (<=1.2.3), неполная до следующей (20 -> <21, 2.3 -> <2.4).
+    """
+    parts = high.rstrip(".").split(".")
+    if len(parts) >= 3:
+        return [f">={low}", f"<={high}"]
+    parts[-1] = str(int(parts[-1]) + 1)
+    return [f">={low}", "<" + ".".join(parts)]
+
+
+def _alternatives(spec: str) -> list:
+    """Спецификация -> список альтернатив (через ||), каждая — список условий, которые должны выполняться вместе."""
+    # ">= 3.8, < 3.12" -> ">=3.8, <3.12": иначе оператор отрывается от версии при разбиении
+    spec = re.sub(r"([<>=!~^]+)\s+", r"\1", spec)
+
+    alternatives = []
+    for alternative in spec.split("||"):
+        alternative = alternative.strip()
+        hyphen = re.match(r"^v?([\d.]+)\s+-\s+v?([\d.]+)$", alternative)
+        if hyphen:
+            alternatives.append(_hyphen_clauses(*hyphen.groups()))
+        else:
+            alternatives.append(re.split(r"[,\s]+(?=[<>=!~^\d])", alternative))
+    return alternatives
+
+
+def select_versions(spec: str, known: list) -> list:
+    """
+    Выбирает из known версии, удовлетворяющие спецификации:
+    PEP 440 (">=3.9,<3.13"), poetry ("^3.9") или npm (">=18 || 20.x", "16 - 20").
+    """
+    if not spec:
+        return []
+
+    alternatives = _alternatives(spec)
+    result = []
+    for candidate in known:
+        if any(all(_satisfies(candidate, c) for c in clauses) for clauses in alternatives):
+            result.append(candidate)
+    return result
+
+
+def spec_lower_bound(spec: str) -> str:
+    """
+    Нижняя граница спецификации ("^16" -> 16, "==3.7.*" -> 3.7, ">=3.6,<4" -> 3.6):
+    по альтернативам — наименьшая, внутри альтернативы — наибольшая из ограничений снизу.
+    """
+    bounds = []
+    for clauses in _alternatives(spec or ""):
+        lows = []
+        for clause in clauses:
+            m = re.match(r"^(>=|==|~=|>|\^|~|=)?\s*v?(\d+(?:\.\d+)*)", clause.strip())
+            if m:
+                lows.append(m.group(2))
+        if lows:
+            bounds.append(max(lows, key=_version_tuple))
+    return min(bounds, key=_version_tuple) if bounds else ""
+
+
+def supported_versions(spec: str, known: list) -> list:
+    """
+    Версии для матрицы по спецификации. Если ни одна из известных не подходит (спецификация целиком
+    старше или новее списка), берётся её нижняя граница — так же, как go-директива в parse_go_mod_versions.
+    """
+    versions = select_versions(spec, known)
+    if spec and not versions:
+        bound = spec_lower_bound(spec)
+        versions = [bound] if bound else []
+    return versions
+
+
+def minimum_version(versions: list, spec: str = "", default: str = "") -> str:
+    """
+    Версия тулчейна для джоб вне матрицы (lint, build, install) и для файлов окружения:
+    минимальная из поддерживаемых, иначе сама спецификация, если это точная версия.
+    """
+    if versions:
+        return versions[0]
+    m = re.match(r"^\s*v?(\d+(?:\.\d+)*)\s*$", spec or "")
+    return m.group(1) if m else default
+
+
+def versions_from_minimum(minimum: str, known: list) -> list:
+    """Все известные версии начиная с минимальной (go-директива, Java release)."""
+    if not minimum:
+        return []
+    return select_versions(f">={minimum}", known)
+
+
+# -----------------------
+# ИЗВЛЕЧЕНИЕ ДИАПАЗОНОВ
+# -----------------------
+def parse_python_requires(text: str) -> str:
+    """requires-python (pyproject), python_requires (setup.py/setup.cfg) или python (poetry)."""
+    patterns = [
+        r"requires-python\s*=\s*[\"']([^\"']+)[\"']",
+        r"python_requires\s*=\s*[\"']([^\"']+)[\"']",
+        r"python_requires\s*=\s*([^\n]+)",
+        r"^python\s*=\s*[\"']([^\"']+)[\"']",
+    ]
+    for pattern in patterns:
+        m = re.search(pattern, text or "", re.MULTILINE)
+        if m:
+            return m.group(1).strip()
+    return ""
+
+
+def parse_go_mod_versions(text: str) -> list:
+    """Версии Go по директивам go/toolchain в go.mod."""
+    go = re.search(r"^go\s+(\d+\.\d+)", text or "", re.MULTILINE)
+    toolchain = re.search(r"^toolchain\s+go(\d+\.\d+)", text or "", re.MULTILINE)
+
+    versions = versions_from_minimum(go.group(1) if go else "", GO_VERSIONS)
+    if go and not versions:
+        # go-директива новее всех известных версий
+        versions = [go.group(1)]
+    if toolchain and toolchain.group(1) not in versions:
+        versions.append(toolchain.group(1))
+    return sorted(versions, key=_version_tuple)
+
+
+def parse_java_release(text: str) -> str:
+    """Версия Java из Gradle toolchain / sourceCompatibility или maven.compiler.release."""
+    patterns = [
+        r"JavaLanguageVersion\.of\(\s*(\d+)\s*\)",
+        r"<maven\.compiler\.release>\s*(\d+)\s*</maven\.compiler\.release>",
+        r"<release>\s*(\d+)\s*</release>",
+        r"<maven\.compiler\.source>\s*(?:1\.)?(\d+)\s*</maven\.compiler\.source>",
+        r"sourceCompatibility\s*=\s*JavaVersion\.VERSION_(?:1_)?(\d+)",
+        r"sourceCompatibility\s*=\s*[\"']?(?:1\.)?(\d+)",
+    ]
+    for pattern in patterns:
+        m = re.search(pattern, text or "")
+        if m:
+            return m.group(1)
+    return ""
+
+
+# -----------------------
+# ПОСТРОЕНИЕ МАТРИЦЫ
+# -----------------------
+def cap_matrix(axes: dict, max_size: int = DEFAULT_MAX_MATRIX) -> dict:
+    """
+    Урезает оси, пока произведение не уложится в max_size.
+    Сначала выбрасываются промежуточные версии: крайние (минимальная и новейшая) сохраняются дольше всего.
+    """
+    axes = {name: list(values) for name, values in axes.items() if values}
+
+    def size():
+        total = 1
+        for values in axes.values():
+            total *= len(values)
+        return total
+
+    while axes and size() > max(max_size, 1):
+        name = max(axes, key=lambda n: len(axes[n]))
+        values = axes[name]
+        if len(values) > 2:
+            del values[1]
+        else:
+            del values[0]
+    return axes
+
+
+def parallel_matrix(axes: dict, max_size: int = DEFAULT_MAX_MATRIX):
+    """Блок parallel:matrix для джобы или None, если матрица из одного варианта."""
+    axes = cap_matrix(axes, max_size)
+    if not axes or len(list(product(*axes.values()))) < 2:
+        return None
+    return {"matrix": [axes]}
+
+
+def parse_targets(raw: str) -> list:
+    """'linux/amd64, darwin/arm64' -> ['linux/amd64', 'darwin/arm64']"""
+    targets = []
+    for item in (raw or "").split(","):
+        item = item.strip()
+        if re.match(r"^[a-z0-9]+/[a-z0-9]+$", item):
+            targets.append(item)
+    return targets
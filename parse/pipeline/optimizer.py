@@ -0,0 +1,194 @@
+import re
+import copy
+from fnmatch import fnmatch
+from tracing import traced
+
+# Служебные ключи GitLab CI, которые не являются джобами
+RESERVED_KEYS = {"stages", "variables", "default", "include", "workflow", "image", "services", "cache"}
+
+# Каталоги зависимостей: их дешевле держать в cache, чем гонять как артефакты
+DEPENDENCY_DIRS = ["node_modules/", ".venv/", "vendor/", ".gradle/", ".m2/repository/", ".go/pkg/mod/"]
+
+# Выгрузка "всего подряд" -> реальные результаты сборки
+NARROWED_PATHS = {
+    "./": ["bin/"],
+    "target/": ["target/*.jar"],
+    "build/": ["build/libs/*.jar"],
+}
+
+# Грубая оценка размера пути в байтах (первое совпадение по шаблону)
+MB = 1024 * 1024
+ESTIMATED_PATH_BYTES = [
+    ("node_modules/", 400 * MB),
+    (".venv/", 300 * MB),
+    ("vendor/", 150 * MB),
+    (".gradle/", 300 * MB),
+    (".m2/repository/", 300 * MB),
+    ("./", 500 * MB),
+    ("target/", 150 * MB),
+    ("build/", 100 * MB),
+    ("*.jar", 20 * MB),
+    ("*/build/libs/", 20 * MB),
+    ("bin/", 30 * MB),
+    ("dist/", 10 * MB),
+    ("*.yml", 64 * 1024),
+    ("*.yaml", 64 * 1024),
+]
+DEFAULT_PATH_BYTES = 50 * MB
+
+# Команды, по тексту которых не видно, какие файлы они читают (npm-скрипты, make): считаем, что нужны все артефакты
+OPAQUE_COMMANDS = re.compile(r"\b(npm|yarn|pnpm)\b|\bmake\b")
+
+
+def estimate_path_bytes(path: str) -> int:
+    for pattern, size in ESTIMATED_PATH_BYTES:
+        if path == pattern or fnmatch(path, pattern):
+            return size
+    return DEFAULT_PATH_BYTES
+
+
+def get_jobs(ci: dict) -> dict:
+    return {name: job for name, job in ci.items()
+            if name not in RESERVED_KEYS and not name.startswith(".") and isinstance(job, dict)}
+
+
+def _artifact_paths(job: dict) -> list:
+    return list((job.get("artifacts") or {}).get("paths") or [])
+
+
+def job_instances(job: dict) -> int:
+    """Сколько экземпляров джобы запустит parallel (число или parallel:matrix)."""
+    parallel = job.get("parallel")
+    if isinstance(parallel, int):
+        return parallel
+    if not isinstance(parallel, dict):
+        return 1
+
+    total = 0
+    for entry in parallel.get("matrix", []):
+        count = 1
+        for values in entry.values():
+            count *= len(values) if isinstance(values, list) else 1
+        total += count
+    return max(total, 1)
+
+
+def _upstream_jobs(ci: dict, name: str) -> list:
+    """Джобы, чьи артефакты скачает данная джоба (с учётом поведения GitLab по умолчанию)."""
+    jobs = get_jobs(ci)
+    job = jobs[name]
+    if "dependencies" in job:
+        return [d for d in job["dependencies"] if d in jobs]
+
+    stages = ci.get("stages", [])
+    if job.get("stage") not in stages:
+        return []
+    index = stages.index(job["stage"])
+    return [other for other, other_job in jobs.items()
+            if other_job.get("stage") in stages[:index]]
+
+
+def _uses_paths(job: dict, paths: list) -> bool:
+    """Упоминает ли скрипт джобы какой-нибудь из путей (bin/, dist/, */build/libs/*.jar -> .../build/libs)."""
+    script = "\n".join(str(line) for key in ("before_script", "script", "after_script") for line in job.get(key) or [])
+    if OPAQUE_COMMANDS.search(script):
+        return True
+    for path in paths:
+        stem = path.split("*", 1)[0].rstrip("/")
+        if not stem or stem == "." or stem in script:
+            return True
+    return False
+
+
+def estimate_bytes_moved(ci: dict) -> int:
+    """Оценка объёма артефактов за пайплайн: выгрузка + скачивание всеми потребителями."""
+    jobs = get_jobs(ci)
+    sizes = {name: sum(estimate_path_bytes(p) for p in _artifact_paths(job)) * job_instances(job)
+             for name, job in jobs.items()}
+
+    total = sum(sizes.values())
+    for name, job in jobs.items():
+        total += sum(sizes[up] for up in _upstream_jobs(ci, name)) * job_instances(job)
+    return total
+
+
+@traced("pipeline.optimize")
+def optimize_pipeline(ci: dict):
+    """
+    Оптимизирует граф джоб перед сохранением:
+    каталоги зависимостей уходят в cache, артефакты сужаются до реальных
+    результатов сборки, лишние dependencies выкидываются, а джобам,
+    которым артефакты не нужны, ставится dependencies: [].
+    Возвращает (новый_ci, отчёт).
+    """
+    before = estimate_bytes_moved(ci)
+    ci = copy.deepcopy(ci)
+    jobs = get_jobs(ci)
+
+    # 1. Каталоги зависимостей -> cache, сужение путей
+    cached_by = {}
+    for name, job in jobs.items():
+        paths = _artifact_paths(job)
+        if not paths:
+            continue
+
+        cache_paths, kept = [], []
+        for path in paths:
+            if path in DEPENDENCY_DIRS:
+                cache_paths.append(path)
+            else:
+                kept.extend(NARROWED_PATHS.get(path, [path]))
+
+        if cache_paths:
+            job["cache"] = {"key": f"{name}-$CI_COMMIT_REF_SLUG", "paths": cache_paths, "policy": "pull-push"}
+            cached_by[name] = job["cache"]
+
+        if kept:
+            job["artifacts"]["paths"] = kept
+        else:
+            del job["artifacts"]["paths"]
+            if not any(k in job["artifacts"] for k in ("reports", "untracked")):
+                del job["artifacts"]
+
+    # 2. Потребители кэша и ненужные dependencies
+    for name, job in jobs.items():
+        if "dependencies" not in job:
+            continue
+
+        for up in job["dependencies"]:
+            if up in cached_by and "cache" not in job:
+                job["cache"] = dict(copy.deepcopy(cached_by[up]), policy="pull")
+                # cache в GitLab не гарантирован (другой раннер, вытесненный ключ): без него
+                # зависимости ставятся заново той же командой, что и в джобе-источнике
+                install = " && ".join(str(line) for line in jobs[up].get("script") or [])
+                if install:
+                    fallback = [f'if [ ! -d "{path.rstrip("/")}" ]; then {install}; fi'
+                                for path in cached_by[up]["paths"]]
+                    job["before_script"] = fallback + list(job.get("before_script") or [])
+
+        job["dependencies"] = [up for up in job["dependencies"]
+                               if up in jobs and _artifact_paths(jobs[up])
+                               and _uses_paths(job, _artifact_paths(jobs[up]))]
+
+    # 3. Джобы без dependencies по умолчанию качают артефакты всех предыдущих стадий:
+    #    если скрипт их не использует (например, заглушка deploy), явно отказываемся
+    for name, job in jobs.items():
+        if "dependencies" in job or "needs" in job:
+            continue
+        upstream_paths = [p for up in _upstream_jobs(ci, name) for p in _artifact_paths(jobs[up])]
+        if upstream_paths and not _uses_paths(job, upstream_paths):
+            job["dependencies"] = []
+
+    after = estimate_bytes_moved(ci)
+    report = {
+        "bytes_moved_before": before,
+        "bytes_moved_after": after,
+        "cached_jobs": sorted(cached_by),
+    }
+    return ci, report
+
+
+def format_report(report: dict) -> str:
+    before = report["bytes_moved_before"] / MB
+    after = report["bytes_moved_after"] / MB
+    return f"Артефакты за пайплайн: ~{before:.1f} MB → ~{after:.1f} MB"
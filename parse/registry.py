@@ -0,0 +1,128 @@
+import sys
+from importlib import import_module
+from enums.languages import Languages
+
+# Сторонние бэкенды (Rust, .NET, ...) регистрируются через entry points этой группы:
+#   [project.entry-points."ci_cd_without_devops.backends"]
+#   Rust = "ci_rust.backend:run"
+# Имя entry point — название языка так, как его возвращает GitHub /languages.
+# Расширения файлов для режима --path бэкенд объявляет в модуле: EXTENSIONS = (".rs",)
+ENTRY_POINT_GROUP = "ci_cd_without_devops.backends"
+
+# Встроенные бэкенды: модуль с функцией run(main), импортируется только при выборе языка
+BUILTIN_BACKENDS = {
+    Languages.JAVA: "parse_java.backend",
+    Languages.PYTHON: "parse_python.backend",
+    Languages.JAVASCRIPT: "parse_javascript.backend",
+    Languages.GO: "parse_go.backend",
+}
+
+# Расширения файлов встроенных языков: по ним считаются байты кода в локальном checkout
+BUILTIN_EXTENSIONS = {
+    Languages.JAVA: (".java",),
+    Languages.PYTHON: (".py",),
+    Languages.JAVASCRIPT: (".js", ".jsx", ".mjs", ".cjs", ".ts", ".tsx"),
+    Languages.GO: (".go",),
+}
+
+_targets = {language.value: target for language, target in BUILTIN_BACKENDS.items()}
+_extensions = {language.value: exts for language, exts in BUILTIN_EXTENSIONS.items()}
+_loaded = {}
+
+
+def _key(language) -> str:
+    return language.value if isinstance(language, Languages) else language
+
+
+def register(language, target, extensions=()):
+    """Регистрирует бэкенд: путь 'module' / 'module:func' или сам callable, и расширения его файлов."""
+    key = _key(language)
+    _targets[key] = target
+    _loaded.pop(key, None)
+    if extensions:
+        _extensions[key] = tuple(extensions)
+
+
+def _resolve(target):
+    if callable(target):
+        return target
+    module_name, _, attr = target.partition(":")
+    module = import_module(module_name)
+    return getattr(module, attr or "run")
+
+
+def _entry_points():
+    from importlib.metadata import entry_points
+
+    eps = entry_points()
+    return eps.select(group=ENTRY_POINT_GROUP) if hasattr(eps, "select") else eps.get(ENTRY_POINT_GROUP, [])
+
+
+def _load_entry_point(ep):
+    obj = ep.load()
+    return obj if callable(obj) else getattr(obj, "run")
+
+
+def _from_entry_points(name: str):
+    for ep in _entry_points():
+        if ep.name == name:
+            return _load_entry_point(ep)
+    return None
+
+
+def _declared_extensions(backend) -> tuple:
+    """EXTENSIONS из модуля бэкенда (или атрибут extensions у самой функции run)."""
+    module = sys.modules.get(getattr(backend, "__module__", ""))
+    return tuple(getattr(backend, "extensions", None) or getattr(module, "EXTENSIONS", ()))
+
+
+def _plugin_extensions(name: str, loader) -> tuple:
+    """
+    Расширения бэкенда, который приходится загрузить. Сломанный плагин не должен ломать определение
+    остальных языков: он пропускается с предупреждением (один раз за процесс — результат кэшируется в _extensions).
+    """
+    try:
+        return _declared_extensions(loader())
+    except Exception as e:
+        print(f"[WARN] Бэкенд {name} пропущен: не удалось загрузить ({type(e).__name__}: {e})")
+        return ()
+
+
+def extensions() -> dict:
+    """
+    {расширение: язык} для определения языка в локальном checkout.
+    Бэкенды без явно переданных расширений и из entry points для этого загружаются:
+    иначе их язык нельзя выбрать в режиме --path.
+    """
+    for key in _targets:
+        if key not in _extensions:
+            _extensions[key] = _plugin_extensions(key, lambda: load(key))
+
+    def load_entry_point(ep):
+        if ep.name not in _loaded:
+            _loaded[ep.name] = _load_entry_point(ep)
+        return _loaded[ep.name]
+
+    for ep in _entry_points():
+        if ep.name in _extensions or ep.name in _targets:
+            continue
+        _extensions[ep.name] = _plugin_extensions(ep.name, lambda: load_entry_point(ep))
+
+    mapping = {}
+    for language, exts in _extensions.items():
+        for ext in exts:
+            mapping.setdefault(ext, language)
+    return mapping
+
+
+def load(language):
+    """Функция run(main) для языка или None, если бэкенда нет."""
+    key = _key(language)
+    if key not in _loaded:
+        if key in _targets:
+            _loaded[key] = _resolve(_targets[key])
+        elif key:
+            _loaded[key] = _from_entry_points(key)
+        else:
+            _loaded[key] = None
+    return _loaded[key]
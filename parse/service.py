@@ -0,0 +1,292 @@
+"""
+Долгоживущий сервис генерации CI: принимает задания по HTTP, складывает их
+в ограниченную очередь и выполняет пулом воркеров. Между заданиями остаются
+тёплыми пул HTTP-соединений, кэш ответов GitHub (ETag), зеркала git-клонов
+и кэш метаданных индекса пакетов.
+
+    python parse/service.py --port 8080 --workers 4
+
+    POST /jobs      {"repo": "https://github.com/owner/repo", "sha": "...", "matrix": true}
+    GET  /jobs/<id>
+    GET  /metrics
+"""
+import os
+import re
+import json
+import time
+import queue
+import uuid
+import shutil
+import argparse
+import threading
+import traceback
+from collections import deque
+from urllib.parse import urlparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from index import Main
+from parse_python.autogen_env import get_package_index, parse_github_url
+from pipeline.matrix import DEFAULT_MAX_MATRIX, parse_targets
+
+# Параметры задания, которые можно передать в POST /jobs
+JOB_OPTIONS = ("matrix", "max_matrix", "go_targets", "lock")
+
+# Сколько заданий держать в памяти для GET /jobs/<id>
+MAX_KEPT_JOBS = 10000
+
+# sha попадает в URL API (?ref=, git/trees/<ref>) и в git checkout/fetch — принимаем только хеш коммита
+SHA_PATTERN = re.compile(r"^[0-9a-fA-F]{7,40}$")
+GITHUB_NAME_PATTERN = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+
+def canonical_repo_url(repo: str):
+    """https://github.com/owner/repo или None, если это не адрес репозитория на GitHub (file://, другой хост, ...)."""
+    parsed = urlparse(repo.strip())
+    if parsed.scheme not in ("https", "http") or parsed.hostname not in ("github.com", "www.github.com"):
+        return None
+    try:
+        owner, name = parse_github_url(repo.strip())
+    except ValueError:
+        return None
+    if not all(GITHUB_NAME_PATTERN.match(part) and part not in (".", "..") for part in (owner, name)):
+        return None
+    return f"https://github.com/{owner}/{name}"
+
+
+class Job:
+    def __init__(self, repo: str, sha: str, options: dict):
+        self.id = uuid.uuid4().hex[:12]
+        self.repo = repo
+        self.sha = sha
+        self.options = options
+        self.status = "queued"
+        self.error = None
+        self.outputs = []
+        self.default_branch_sources = []
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def key(self):
+        """Ключ дедупликации: один и тот же репозиторий, SHA и параметры."""
+        return self.repo, self.sha or "HEAD", json.dumps(self.options, sort_keys=True)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "repo": self.repo,
+            "sha": self.sha,
+            "options": self.options,
+            # Коммит, к которому на самом деле относится результат: SBOM и /languages GitHub
+            # отдаёт только для ветки по умолчанию
+            "analysed_ref": "default branch" if self.default_branch_sources or not self.sha else self.sha,
+            "default_branch_sources": self.default_branch_sources,
+            "status": self.status,
+            "error": self.error,
+            "outputs": self.outputs,
+            "queue_wait_ms": _ms(self.created_at, self.started_at),
+            "run_ms": _ms(self.started_at, self.finished_at),
+        }
+
+
+def _ms(start, end):
+    return round((end - start) * 1000, 1) if start and end else None
+
+
+def _percentiles(values):
+    if not values:
+        return {"p50": None, "p95": None, "max": None}
+    ordered = sorted(values)
+    pick = lambda q: round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 1)
+    return {"p50": pick(0.5), "p95": pick(0.95), "max": round(ordered[-1], 1)}
+
+
+class GeneratorService:
+    def __init__(self, work_dir: str, workers: int = 2, queue_size: int = 100, index_url: str = None):
+        self.work_dir = os.path.abspath(work_dir)
+        self.mirror_dir = os.path.join(self.work_dir, "mirrors")
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.jobs = {}
+        self.in_flight = {}
+        self.lock = threading.Lock()
+        self.completed = 0
+        self.failed = 0
+        self.deduplicated = 0
+        self.queue_wait_ms = deque(maxlen=1000)
+        self.run_ms = deque(maxlen=1000)
+        # Общий на все задания кэш метаданных индекса пакетов
+        self.package_index = get_package_index(index_url, cache_dir=os.path.join(self.work_dir, "package_index"))
+        self.workers = [threading.Thread(target=self._worker, daemon=True) for _ in range(workers)]
+
+    def start(self):
+        for worker in self.workers:
+            worker.start()
+        return self
+
+    def submit(self, repo: str, sha: str = None, options: dict = None):
+        """(job, deduplicated). Бросает queue.Full, если очередь переполнена."""
+        job = Job(repo.rstrip("/").removesuffix(".git"), sha, options or {})
+        with self.lock:
+            existing = self.in_flight.get(job.key)
+            if existing is not None:
+                self.deduplicated += 1
+                return existing, True
+            self.queue.put_nowait(job)
+            self.jobs[job.id] = job
+            self.in_flight[job.key] = job
+        return job, False
+
+    def _worker(self):
+        while True:
+            job = self.queue.get()
+            job.status = "running"
+            job.started_at = time.time()
+            try:
+                self._run(job)
+                job.status = "done"
+            except Exception as e:
+                job.status = "failed"
+                job.error = f"{type(e).__name__}: {e}"
+                traceback.print_exc()
+            finally:
+                job.finished_at = time.time()
+                with self.lock:
+                    self.in_flight.pop(job.key, None)
+                    forgotten = self._forget_old_jobs()
+                    if job.status == "done":
+                        self.completed += 1
+                    else:
+                        self.failed += 1
+                    self.queue_wait_ms.append((job.started_at - job.created_at) * 1000)
+                    self.run_ms.append((job.finished_at - job.started_at) * 1000)
+                # Результаты забытых заданий больше не доступны через API — удаляем их с диска
+                for old in forgotten:
+                    shutil.rmtree(self._output_dir(old), ignore_errors=True)
+                self.queue.task_done()
+
+    def _forget_old_jobs(self):
+        finished = [j for j in self.jobs.values() if j.finished_at]
+        forgotten = sorted(finished, key=lambda j: j.finished_at)[:max(0, len(self.jobs) - MAX_KEPT_JOBS)]
+        for old in forgotten:
+            del self.jobs[old.id]
+        return forgotten
+
+    def _output_dir(self, job: Job):
+        return os.path.join(self.work_dir, "jobs", job.id)
+
+    def _run(self, job: Job):
+        output_dir = self._output_dir(job)
+        os.makedirs(os.path.join(output_dir, "dependencies"), exist_ok=True)
+        os.makedirs(os.path.join(output_dir, ".gitlab", "workflows"), exist_ok=True)
+
+        main = Main(
+            job.repo,
+            matrix=bool(job.options.get("matrix")),
+            max_matrix=int(job.options.get("max_matrix", DEFAULT_MAX_MATRIX)),
+            go_targets=parse_targets(job.options.get("go_targets", "")),
+            lock=bool(job.options.get("lock")),
+            output_dir=output_dir,
+            ref=job.sha,
+            mirror_dir=self.mirror_dir,
+            package_index=self.package_index,
+        )
+        try:
+            main.launch_project()
+        finally:
+            job.default_branch_sources = main.default_branch_sources
+
+        for root, _, files in os.walk(output_dir):
+            for name in files:
+                job.outputs.append(os.path.relpath(os.path.join(root, name), output_dir))
+        job.outputs.sort()
+
+    def metrics(self):
+        with self.lock:
+            return {
+                "queue_depth": self.queue.qsize(),
+                "queue_capacity": self.queue.maxsize,
+                "in_flight": len(self.in_flight),
+                "completed": self.completed,
+                "failed": self.failed,
+                "deduplicated": self.deduplicated,
+                "workers": len(self.workers),
+                "queue_wait_ms": _percentiles(list(self.queue_wait_ms)),
+                "run_ms": _percentiles(list(self.run_ms)),
+            }
+
+
+def make_handler(service: GeneratorService):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status, body):
+            data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path == "/health":
+                return self._send(200, {"status": "ok"})
+            if self.path == "/metrics":
+                return self._send(200, service.metrics())
+            if self.path.startswith("/jobs/"):
+                job = service.jobs.get(self.path[len("/jobs/"):])
+                if job is None:
+                    return self._send(404, {"error": "job not found"})
+                return self._send(200, job.to_dict())
+            self._send(404, {"error": "not found"})
+
+        def do_POST(self):
+            if self.path != "/jobs":
+                return self._send(404, {"error": "not found"})
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+            except ValueError:
+                return self._send(400, {"error": "invalid JSON"})
+
+            if not isinstance(payload, dict):
+                return self._send(400, {"error": "body must be a JSON object"})
+
+            repo = payload.get("repo")
+            repo = canonical_repo_url(repo) if isinstance(repo, str) else None
+            if repo is None:
+                return self._send(400, {"error": "'repo' must be a GitHub URL"})
+
+            sha = payload.get("sha")
+            if sha is not None and (not isinstance(sha, str) or not SHA_PATTERN.match(sha)):
+                return self._send(400, {"error": "'sha' must be a commit hash (7-40 hex characters)"})
+
+            options = {k: payload[k] for k in JOB_OPTIONS if k in payload}
+            try:
+                job, deduplicated = service.submit(repo, sha, options)
+            except queue.Full:
+                return self._send(503, {"error": "queue is full", **service.metrics()})
+            self._send(200 if deduplicated else 202, {**job.to_dict(), "deduplicated": deduplicated})
+
+    return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the CI generator as a long-lived HTTP service")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Address to bind")
+    parser.add_argument("--port", type=int, default=8080, help="Port to bind")
+    parser.add_argument("--workers", type=int, default=2, help="Number of worker threads")
+    parser.add_argument("--queue-size", type=int, default=100, help="Maximum number of queued jobs")
+    parser.add_argument("--work-dir", type=str, default=".service", help="Directory for job outputs, git mirrors and caches")
+    parser.add_argument("--index-url", type=str, default=None, help="Package index used to verify pinned Python versions")
+    args = parser.parse_args()
+
+    service = GeneratorService(args.work_dir, workers=args.workers, queue_size=args.queue_size,
+                               index_url=args.index_url).start()
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(service))
+    print(f"Сервис запущен: http://{args.host}:{args.port} (воркеров: {args.workers})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,121 @@
+import os
+import json
+import time
+import functools
+import threading
+from contextlib import contextmanager
+
+
+class Tracer:
+    """
+    Лёгкий трассировщик: вложенные спаны с таймингами и счётчики
+    (HTTP-запросы, байты, попадания в кэш, ожидание rate limit).
+    Пока enabled=False, спаны ничего не записывают.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.origin = time.perf_counter()
+            self.events = []
+            self.counters = {}
+
+    @contextmanager
+    def span(self, name: str, **args):
+        if not self.enabled:
+            yield
+            return
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            with self.lock:
+                self.events.append({
+                    "name": name,
+                    "start": start - self.origin,
+                    "duration": end - start,
+                    "tid": threading.get_ident(),
+                    "args": args,
+                })
+
+    def count(self, name: str, value=1):
+        if not self.enabled:
+            return
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def to_chrome_trace(self) -> dict:
+        """Формат Chrome trace (chrome://tracing, Perfetto)."""
+        events = [{
+            "name": e["name"],
+            "cat": e["name"].split(".", 1)[0],
+            "ph": "X",
+            "ts": round(e["start"] * 1e6),
+            "dur": round(e["duration"] * 1e6),
+            "pid": os.getpid(),
+            "tid": e["tid"],
+            "args": e["args"],
+        } for e in self.events]
+        return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": dict(self.counters)}
+
+    def summary(self) -> dict:
+        spans = {}
+        for e in self.events:
+            s = spans.setdefault(e["name"], {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            s["count"] += 1
+            s["total_ms"] += e["duration"] * 1000
+            s["max_ms"] = max(s["max_ms"], e["duration"] * 1000)
+        return {"spans": spans, "counters": dict(self.counters)}
+
+    def write_trace(self, output_file: str):
+        os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+        with open(output_file, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(), f)
+
+
+tracer = Tracer()
+span = tracer.span
+count = tracer.count
+
+
+def traced(name: str = None):
+    """Декоратор: оборачивает вызов функции в спан."""
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with tracer.span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def merge_summaries(summaries: list) -> dict:
+    """Сводка по нескольким репозиториям (batch-запуск)."""
+    merged = {"repos": len(summaries), "spans": {}, "counters": {}}
+    for summary in summaries:
+        for name, s in summary["spans"].items():
+            m = merged["spans"].setdefault(name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            m["count"] += s["count"]
+            m["total_ms"] += s["total_ms"]
+            m["max_ms"] = max(m["max_ms"], s["max_ms"])
+        for name, value in summary["counters"].items():
+            merged["counters"][name] = merged["counters"].get(name, 0) + value
+    return merged
+
+
+def format_summary(summary: dict, top: int = 15) -> str:
+    lines = [f"{'span':<45} {'count':>6} {'total ms':>10} {'max ms':>10}"]
+    spans = sorted(summary["spans"].items(), key=lambda kv: kv[1]["total_ms"], reverse=True)
+    for name, s in spans[:top]:
+        lines.append(f"{name:<45} {s['count']:>6} {s['total_ms']:>10.1f} {s['max_ms']:>10.1f}")
+    for name, value in sorted(summary["counters"].items()):
+        lines.append(f"{name:<45} {value:>6.0f}" if isinstance(value, float) else f"{name:<45} {value:>6}")
+    return "\n".join(lines)
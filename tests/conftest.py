@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Модули импортируются так же, как при запуске скриптов: из parse/ и benchmarks/
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "parse"))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
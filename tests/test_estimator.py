@@ -0,0 +1,45 @@
+from pipeline.estimator import analyze, build_dag, critical_path, optional_jobs, simulate
+
+# a -> b -> d, a -> c -> d
+DAG = {"a": [], "b": ["a"], "c": ["a"], "d": ["b", "c"]}
+DURATIONS = {"a": 10, "b": 30, "c": 20, "d": 5}
+
+
+def test_critical_path():
+    assert critical_path(DAG, DURATIONS) == (["a", "b", "d"], 45)
+    assert critical_path({}, {}) == ([], 0)
+
+
+def test_simulate_unlimited_and_limited_runners():
+    wall, profile = simulate(DAG, DURATIONS, {})
+    assert wall == 45
+    assert profile == [(0, 1), (10, 2), (30, 1), (40, 1), (45, 0)]
+
+    # один раннер: всё последовательно
+    assert simulate(DAG, DURATIONS, {}, runners=1)[0] == 65
+    # три экземпляра b на двух раннерах: c и b×3 делят раннеры
+    assert simulate(DAG, DURATIONS, {"b": 3}, runners=2)[0] == 10 + 30 + 30 + 5
+
+
+def pipeline():
+    return {
+        "stages": ["build", "test", "deploy"],
+        "build": {"stage": "build", "script": ["make"]},
+        "test": {"stage": "test", "script": ["make test"]},
+        "deploy": {"stage": "deploy", "script": ["make deploy"], "when": "manual"},
+        "pages": {"stage": "deploy", "script": ["make docs"], "only": ["main"]},
+        "notify": {"stage": "deploy", "script": ["echo done"], "needs": ["deploy"]},
+    }
+
+
+def test_manual_and_branch_only_jobs_are_excluded():
+    ci = pipeline()
+    assert optional_jobs(ci) == {"deploy": "when: manual", "pages": "only", "notify": "needs deploy"}
+    assert build_dag(ci) == {"build": [], "test": ["build"]}
+
+    timings = {"build": 60, "test": 120, "deploy": 300, "pages": 90, "notify": 5}
+    result = analyze(ci, {"modules": 1, "dependencies": 0, "test_files": 0}, timings=timings)
+    assert result["critical_path"] == ["build", "test"]
+    assert result["wall_seconds"] == 180
+    assert set(result["jobs"]) == {"build", "test"}
+    assert result["optional_jobs"]["deploy"] == {"seconds": 300, "instances": 1, "reason": "when: manual"}
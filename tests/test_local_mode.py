@@ -0,0 +1,96 @@
+import yaml
+import pytest
+import requests
+
+import github_api
+from index import Main
+from parse_python.autogen_env import get_local_dependencies
+
+
+@pytest.fixture(autouse=True)
+def no_network(monkeypatch):
+    """Локальный режим не должен ходить ни в GitHub, ни в индекс пакетов."""
+    def blocked(*args, **kwargs):
+        raise AssertionError("network access in --path mode")
+
+    monkeypatch.setattr(github_api, "get_session", blocked)
+    monkeypatch.setattr(requests.Session, "send", blocked)
+    monkeypatch.delenv("PYPI_INDEX_URL", raising=False)
+
+
+def write_files(root, files):
+    for rel, content in files.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+
+
+def load(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+
+def test_python_checkout(tmp_path):
+    repo, out = tmp_path / "repo", tmp_path / "out"
+    write_files(repo, {
+        "pyproject.toml": '[project]\nname = "demo"\nrequires-python = ">= 3.11"\n'
+                          'dependencies = ["click==8.1.7", "rich"]\n',
+        "requirements.txt": "requests==2.32.5  # http\n",
+        "demo/__init__.py": "print('demo')\n",
+    })
+
+    main = Main(str(repo), matrix=True, local=True, output_dir=str(out))
+    assert main.language == "Python"
+    main.launch_project()
+
+    env = load(out / "dependencies" / "environment.yml")
+    assert env["dependencies"][0] == "python=3.11"
+    assert sorted(env["dependencies"][2]["pip"]) == ["click==8.1.7", "requests==2.32.5", "rich"]
+
+    ci = load(out / ".gitlab" / "workflows" / "gitlab-ci-py.yml")
+    assert ci["setup_env"]["image"] == "python:3.11-slim"
+    assert ci["run_tests"]["parallel"]["matrix"][0]["PYTHON_VERSION"] == ["3.11", "3.12", "3.13"]
+
+
+def test_go_checkout(tmp_path):
+    repo, out = tmp_path / "repo", tmp_path / "out"
+    write_files(repo, {
+        "go.mod": "module github.com/acme/tool\n\ngo 1.21\n\nrequire (\n"
+                  "\tgithub.com/spf13/cobra v1.8.0\n\tgolang.org/x/sync v0.6.0 // indirect\n)\n",
+        "main.go": "package main\n\nfunc main() {}\n",
+    })
+
+    main = Main(str(repo), local=True, output_dir=str(out))
+    assert main.language == "Go"
+    main.launch_project()
+
+    go_mod = (out / "dependencies" / "go.mod").read_text(encoding="utf-8")
+    assert go_mod.startswith("module github.com/acme/tool-autogen\ngo 1.21\n")
+    assert "\tgithub.com/spf13/cobra v1.8.0\n" in go_mod and "\tgolang.org/x/sync v0.6.0\n" in go_mod
+
+    ci = load(out / ".gitlab" / "workflows" / "gitlab-ci-go.yml")
+    assert ci["build"]["image"] == "golang:1.21"
+    assert "parallel" not in ci["test"]
+
+
+def test_requirements_formats(tmp_path):
+    write_files(tmp_path, {
+        # pip-compile --generate-hashes: пин на строке с продолжением
+        "requirements.txt": "requests==2.31.0 \\\n    --hash=sha256:aaaa \\\n    --hash=sha256:bbbb\n"
+                            "    # via -r requirements.in\n"
+                            "git+https://github.com/acme/vcs-pkg.git@main#egg=vcs_pkg\n"
+                            "git+https://github.com/acme/no-egg.git\n"
+                            "https://files.example/wheel_pkg-1.0-py3-none-any.whl\n"
+                            "direct[extra] @ https://files.example/direct-1.0.tar.gz\n"
+                            "Rich==13.7.0 ; python_version >= \"3.8\"  # pinned\n"
+                            "-e .\n",
+        # читается первым; тот же пакет в другом регистре не дублируется, пин берётся из requirements.txt
+        "requirements-dev.txt": "REQUESTS\n",
+    })
+
+    assert get_local_dependencies(str(tmp_path)) == [
+        ("direct", ""),
+        ("REQUESTS", "2.31.0"),
+        ("Rich", "13.7.0"),
+        ("vcs_pkg", ""),
+    ]
@@ -0,0 +1,67 @@
+import pytest
+
+from pipeline.matrix import (
+    GO_VERSIONS, NODE_VERSIONS, PYTHON_VERSIONS,
+    cap_matrix, parse_go_mod_versions, select_versions, spec_lower_bound, supported_versions,
+)
+
+
+@pytest.mark.parametrize("spec, known, expected", [
+    (">=3.9,<3.13", PYTHON_VERSIONS, ["3.9", "3.10", "3.11", "3.12"]),
+    (">= 3.8, < 3.10", PYTHON_VERSIONS, ["3.8", "3.9"]),
+    ("^3.10", PYTHON_VERSIONS, ["3.10", "3.11", "3.12", "3.13"]),
+    ("~=3.11", PYTHON_VERSIONS, ["3.11", "3.12", "3.13"]),
+    ("!=3.9.*,>=3.8", PYTHON_VERSIONS, ["3.8", "3.10", "3.11", "3.12", "3.13"]),
+    (">=18 || 20.x", NODE_VERSIONS, ["18", "20", "22"]),
+    ("^18 || ^22", NODE_VERSIONS, ["18", "22"]),
+    ("16 - 20", NODE_VERSIONS, ["18", "20"]),
+    ("18.0.0 - 20.1.0", NODE_VERSIONS, ["18", "20"]),
+    ("3.9 - 3.11", PYTHON_VERSIONS, ["3.9", "3.10", "3.11"]),
+    ("16 - 18 || 22", NODE_VERSIONS, ["18", "22"]),
+    ("", NODE_VERSIONS, []),
+])
+def test_select_versions(spec, known, expected):
+    assert select_versions(spec, known) == expected
+
+
+@pytest.mark.parametrize("spec, expected", [
+    ("16.x", "16"),
+    ("^16", "16"),
+    ("==3.7.*", "3.7"),
+    (">=3.6,<4", "3.6"),
+    ("14 - 16", "14"),
+    ("^14 || ^16", "14"),
+    ("<3", ""),
+])
+def test_spec_lower_bound(spec, expected):
+    assert spec_lower_bound(spec) == expected
+
+
+def test_supported_versions_fall_back_to_lower_bound():
+    # Диапазон целиком старше известных версий: берётся его нижняя граница, а не версия по умолчанию
+    assert supported_versions("^16", NODE_VERSIONS) == ["16"]
+    assert supported_versions("==3.7.*", PYTHON_VERSIONS) == ["3.7"]
+    assert supported_versions(">=3.14", PYTHON_VERSIONS) == ["3.14"]
+    assert supported_versions(">=20", NODE_VERSIONS) == ["20", "22"]
+    assert supported_versions("<3", PYTHON_VERSIONS) == []
+
+
+def test_cap_matrix_keeps_extremes():
+    axes = {"PYTHON_VERSION": list(PYTHON_VERSIONS), "OS": ["linux", "windows"], "EMPTY": []}
+    capped = cap_matrix(axes, max_size=6)
+    assert capped == {"PYTHON_VERSION": ["3.8", "3.12", "3.13"], "OS": ["linux", "windows"]}
+    assert cap_matrix({"GO": GO_VERSIONS}, max_size=1) == {"GO": ["1.23"]}
+    # исходные списки не меняются
+    assert axes["PYTHON_VERSION"] == PYTHON_VERSIONS
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("module x\n\ngo 1.21\n", ["1.21", "1.22", "1.23"]),
+    ("module x\n\ngo 1.22.3\ntoolchain go1.23.1\n", ["1.22", "1.23"]),
+    ("module x\n\ngo 1.19\ntoolchain go1.21.0\n", ["1.20", "1.21", "1.22", "1.23"]),
+    ("module x\n\ngo 1.25\n", ["1.25"]),
+    ("module x\n\ngo 1.24\ntoolchain go1.25.0\n", ["1.24", "1.25"]),
+    ("module x\n", []),
+])
+def test_parse_go_mod_versions(text, expected):
+    assert parse_go_mod_versions(text) == expected
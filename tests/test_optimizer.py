@@ -0,0 +1,37 @@
+from pipeline.optimizer import optimize_pipeline
+
+
+def go_pipeline():
+    return {
+        "stages": ["build", "test", "deploy"],
+        "build": {"stage": "build", "script": ["go build -v -o bin/ ./..."],
+                  "artifacts": {"paths": ["./"]},
+                  "parallel": {"matrix": [{"GO_TARGET": ["linux/amd64", "darwin/arm64"]}]}},
+        "test": {"stage": "test", "script": ["go test -v ./..."], "dependencies": ["build"]},
+        "package": {"stage": "deploy", "script": ["tar czf release.tgz bin/"], "dependencies": ["build"]},
+        "deploy": {"stage": "deploy", "script": ["echo deploy"]},
+    }
+
+
+def test_jobs_that_do_not_use_artifacts_download_nothing():
+    ci, report = optimize_pipeline(go_pipeline())
+    assert ci["build"]["artifacts"]["paths"] == ["bin/"]
+    assert ci["test"]["dependencies"] == []
+    assert ci["deploy"]["dependencies"] == []
+    assert ci["package"]["dependencies"] == ["build"]
+    assert report["bytes_moved_after"] == 4 * 30 * 1024 * 1024  # выгрузка двух сборок матрицы + их скачивание в package
+
+
+def test_cache_consumers_reinstall_when_cache_is_missing():
+    ci, _ = optimize_pipeline({
+        "stages": ["install", "build", "test"],
+        "install": {"stage": "install", "script": ["yarn install"], "artifacts": {"paths": ["node_modules/"]}},
+        "build": {"stage": "build", "script": ["yarn run build"], "artifacts": {"paths": ["dist/"]},
+                  "dependencies": ["install"]},
+        "test": {"stage": "test", "script": ["yarn run test"], "dependencies": ["install", "build"]},
+    })
+    assert "artifacts" not in ci["install"]
+    assert ci["build"]["cache"]["policy"] == "pull"
+    assert ci["build"]["before_script"] == ['if [ ! -d "node_modules" ]; then yarn install; fi']
+    # npm-скрипты непрозрачны: dist/ остаётся у тестов
+    assert ci["test"]["dependencies"] == ["build"]
@@ -0,0 +1,105 @@
+import pytest
+
+from parse_python import package_index
+from parse_python.package_index import PackageIndex
+from parse_python.autogen_env import pin_dependencies, write_requirements_lock
+from stub_index import StubPackageIndex, release_hash
+
+
+@pytest.fixture
+def stub():
+    server = StubPackageIndex({"requests": ["2.31.0", "2.32.5"], "pyyaml": ["6.0.3"]}).start()
+    yield server
+    server.stop()
+
+
+def make_index(stub, tmp_path, ttl=3600):
+    return PackageIndex(stub.url, cache_dir=str(tmp_path / "cache"), ttl=ttl)
+
+
+def test_memory_and_disk_hits(stub, tmp_path):
+    index = make_index(stub, tmp_path)
+    assert index.has_version("Requests", "2.32.5")
+    assert index.hashes("requests", "2.32.5") == [release_hash("requests", "2.32.5")]
+    assert (index.misses, index.hits, stub.requests) == (1, 1, 1)
+
+    # Новый экземпляр (новый запуск) читает дисковый кэш без запроса к индексу
+    again = make_index(stub, tmp_path)
+    assert again.has_version("requests", "2.31.0")
+    assert (again.misses, again.hits, stub.requests) == (0, 1, 1)
+
+
+def test_ttl_expiry_refetches(stub, tmp_path, monkeypatch):
+    make_index(stub, tmp_path, ttl=60).releases("pyyaml")
+    assert stub.requests == 1
+
+    now = package_index.time.time()
+    monkeypatch.setattr(package_index.time, "time", lambda: now + 30)
+    fresh = make_index(stub, tmp_path, ttl=60)
+    fresh.releases("pyyaml")
+    assert (fresh.hits, fresh.misses, stub.requests) == (1, 0, 1)
+
+    monkeypatch.setattr(package_index.time, "time", lambda: now + 120)
+    expired = make_index(stub, tmp_path, ttl=60)
+    expired.releases("pyyaml")
+    assert (expired.hits, expired.misses, stub.requests) == (0, 1, 2)
+
+
+def test_unknown_package_and_version_are_unpinned(stub, tmp_path):
+    index = make_index(stub, tmp_path)
+    specs = pin_dependencies([("requests", "2.32.5"), ("requests", "9.9.9"), ("missing", "1.0")], index)
+    assert specs == ["requests==2.32.5", "requests", "missing"]
+
+
+def test_index_errors_leave_pins_unverified(stub, tmp_path, capsys):
+    stub.failures["requests"] = 503
+    index = make_index(stub, tmp_path)
+
+    assert index.has_version("requests", "2.32.5") is None
+    assert pin_dependencies([("requests", "2.32.5")], index) == ["requests==2.32.5"]
+    assert index.errors == 2
+    assert "[WARN]" in capsys.readouterr().out
+
+    # Ошибка не кэшируется: после восстановления индекса версия проверяется
+    del stub.failures["requests"]
+    assert index.has_version("requests", "2.32.5") is True
+
+
+def test_unreachable_index_does_not_raise(tmp_path):
+    index = PackageIndex("http://127.0.0.1:9", cache_dir=str(tmp_path / "cache"))
+    assert index.has_version("requests", "2.32.5") is None
+    assert index.hashes("requests", "2.32.5") == []
+
+
+def test_lock_lists_skipped_packages(stub, tmp_path):
+    index = make_index(stub, tmp_path)
+    lock = tmp_path / "requirements.lock"
+    write_requirements_lock([("requests", "2.32.5"), ("missing", "1.0"), ("pyyaml", "")], index, out_file=str(lock))
+
+    text = lock.read_text(encoding="utf-8")
+    assert f"requests==2.32.5 \\\n    --hash=sha256:{release_hash('requests', '2.32.5')}" in text
+    assert "#   missing\n" in text and "#   pyyaml\n" in text
+
+
+def test_memory_entries_expire_with_ttl(stub, tmp_path, monkeypatch):
+    # Один экземпляр на всё время работы сервиса: новые релизы видны после истечения TTL
+    index = make_index(stub, tmp_path, ttl=60)
+    assert not index.has_version("pyyaml", "6.0.4")
+
+    stub.packages["pyyaml"].append("6.0.4")
+    now = package_index.time.time()
+    monkeypatch.setattr(package_index.time, "time", lambda: now + 30)
+    assert not index.has_version("pyyaml", "6.0.4")
+    assert stub.requests == 1
+
+    monkeypatch.setattr(package_index.time, "time", lambda: now + 120)
+    assert index.has_version("pyyaml", "6.0.4")
+    assert (index.misses, stub.requests) == (2, 2)
+
+
+def test_memory_is_bounded(stub, tmp_path, monkeypatch):
+    monkeypatch.setattr(package_index, "MEMORY_ENTRIES", 1)
+    index = make_index(stub, tmp_path)
+    index.releases("requests")
+    index.releases("pyyaml")
+    assert list(index.memory) == ["pyyaml"]
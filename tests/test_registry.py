@@ -0,0 +1,69 @@
+import sys
+import types
+import pytest
+
+import registry
+from get_using_languages import Language
+
+
+@pytest.fixture(autouse=True)
+def isolated_registry(monkeypatch):
+    monkeypatch.setattr(registry, "_targets", dict(registry._targets))
+    monkeypatch.setattr(registry, "_extensions", dict(registry._extensions))
+    monkeypatch.setattr(registry, "_loaded", dict(registry._loaded))
+    monkeypatch.setattr(registry, "_entry_points", lambda: [])
+
+
+def make_backend(monkeypatch, module_name, extensions):
+    module = types.ModuleType(module_name)
+    module.EXTENSIONS = extensions
+    exec("def run(main):\n    main.ran = True\n", module.__dict__)
+    monkeypatch.setitem(sys.modules, module_name, module)
+    return module
+
+
+def test_builtin_extensions():
+    mapping = registry.extensions()
+    assert mapping[".py"] == "Python" and mapping[".tsx"] == "JavaScript" and mapping[".go"] == "Go"
+
+
+def test_registered_backend_contributes_extensions(monkeypatch, tmp_path):
+    make_backend(monkeypatch, "ci_rust_backend", (".rs",))
+    registry.register("Rust", "ci_rust_backend:run")
+    registry.register("C#", lambda main: None, extensions=(".cs",))
+
+    (tmp_path / "main.rs").write_text("fn main() {}\n" * 100)
+    (tmp_path / "build.py").write_text("print(1)\n")
+    assert registry.extensions()[".cs"] == "C#"
+    assert Language(str(tmp_path), local=True).get_main_language() == "Rust"
+
+
+def test_entry_point_backend_is_detected_locally(monkeypatch, tmp_path):
+    module = make_backend(monkeypatch, "ci_zig_backend", (".zig",))
+    entry_point = types.SimpleNamespace(name="Zig", load=lambda: module.run)
+    monkeypatch.setattr(registry, "_entry_points", lambda: [entry_point])
+
+    (tmp_path / "main.zig").write_text("pub fn main() void {}\n")
+    assert Language(str(tmp_path), local=True).get_main_language() == "Zig"
+    assert registry.load("Zig") is module.run
+
+
+def test_broken_entry_point_is_skipped(monkeypatch, tmp_path, capsys):
+    module = make_backend(monkeypatch, "ci_zig_backend", (".zig",))
+
+    def broken():
+        raise ImportError("No module named 'ci_broken_backend'")
+
+    entry_points = [types.SimpleNamespace(name="Broken", load=broken),
+                    types.SimpleNamespace(name="Zig", load=lambda: module.run)]
+    monkeypatch.setattr(registry, "_entry_points", lambda: entry_points)
+    registry.register("Nim", "ci_missing_nim_backend")
+
+    (tmp_path / "main.zig").write_text("pub fn main() void {}\n")
+    assert Language(str(tmp_path), local=True).get_main_language() == "Zig"
+    out = capsys.readouterr().out
+    assert "[WARN]" in out and "Broken" in out and "Nim" in out
+
+    # Предупреждение выводится один раз: результат кэшируется
+    registry.extensions()
+    assert capsys.readouterr().out == ""
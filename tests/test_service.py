@@ -0,0 +1,57 @@
+import json
+import threading
+import urllib.request
+import urllib.error
+import pytest
+from http.server import ThreadingHTTPServer
+
+from service import GeneratorService, make_handler
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    monkeypatch.delenv("PYPI_INDEX_URL", raising=False)
+    # Воркеры не запускаются: проверяется только приём заданий
+    service = GeneratorService(str(tmp_path), workers=0)
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(service))
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield service, f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def post(url, body):
+    data = body if isinstance(body, bytes) else json.dumps(body).encode("utf-8")
+    request = urllib.request.Request(f"{url}/jobs", data=data, method="POST")
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+@pytest.mark.parametrize("body", [
+    [],
+    "repo",
+    {"repo": 5},
+    {"repo": "file:///srv/github.com/owner/repo"},
+    {"repo": "https://evil.example/github.com/owner/repo"},
+    {"repo": "https://github.com/owner/repo", "sha": "--upload-pack=touch /tmp/x"},
+    {"repo": "https://github.com/owner/repo", "sha": "main"},
+    {"repo": "https://github.com/owner/repo", "sha": 123},
+])
+def test_rejects_invalid_jobs(server, body):
+    service, url = server
+    status, response = post(url, body)
+    assert status == 400 and "error" in response
+    assert service.queue.qsize() == 0
+
+
+def test_accepts_canonical_repo(server):
+    service, url = server
+    status, job = post(url, {"repo": "https://github.com/Owner/repo.git/", "sha": "0a1b2c3d"})
+    assert status == 202
+    assert job["repo"] == "https://github.com/Owner/repo" and job["sha"] == "0a1b2c3d"
+
+    status, again = post(url, {"repo": "http://www.github.com/Owner/repo", "sha": "0a1b2c3d"})
+    assert status == 200 and again["deduplicated"] and again["id"] == job["id"]